@@ -0,0 +1,193 @@
+"""Micro-benchmark for RefPack decompression.
+
+Compares the previous byte-at-a-time decompressor with sims2.dbpf.decompress on
+synthetic resources of 1 KB, 64 KB and 1 MB that use every kind of RefPack
+control code, and checks that both produce identical output.
+
+Run with: python benchmarks/decompress.py
+"""  # noqa: INP001
+
+import random
+from collections.abc import Callable
+from time import perf_counter
+
+from sims2.dbpf import decompress
+
+SIZES: dict[str, int] = {"1 KB": 1 << 10, "64 KB": 1 << 16, "1 MB": 1 << 20}
+# kinds of control codes in the generated resources and how often each is used
+CONTROL_MIX: tuple[str, ...] = ("short", "medium", "long", "plain")
+CONTROL_WEIGHTS: tuple[int, ...] = (45, 35, 10, 10)
+
+
+def legacy_decompress(data: bytes, limit: float | None = None) -> bytes:
+    """Decompress a resource the way Resource._decompress used to.
+
+    Args:
+        data: Compressed resource, including its 9 byte header.
+        limit: Stop decompressing once at least this many bytes have been decompressed.
+
+    Returns:
+        Decompressed contents of the resource.
+    """
+    x: bytes = b""
+    index: int = 9
+    while index < len(data):
+        if data[index] < 128:  # noqa: PLR2004
+            control: bytes = data[index : index + 2]
+            numplain: int = control[0] & 3
+            numcopy: int = ((control[0] & 28) >> 2) + 3
+            offset: int = ((control[0] & 96) << 3) + control[1] + 1
+            index += 2
+        elif data[index] < 192:  # noqa: PLR2004
+            control = data[index : index + 3]
+            numplain = ((control[1] & 192) >> 6) & 3
+            numcopy = (control[0] & 63) + 4
+            offset = ((control[1] & 63) << 8) + control[2] + 1
+            index += 3
+        elif data[index] < 224:  # noqa: PLR2004
+            control = data[index : index + 4]
+            numplain = control[0] & 3
+            numcopy = ((control[0] & 12) << 6) + control[3] + 5
+            offset = ((control[0] & 16) << 12) + (control[1] << 8) + control[2] + 1
+            index += 4
+        elif data[index] < 252:  # noqa: PLR2004
+            control = data[index : index + 1]
+            numplain = ((control[0] & 31) + 1) << 2
+            numcopy = 0
+            offset = 0
+            index += 1
+        else:
+            control = data[index : index + 1]
+            numplain = control[0] & 3
+            numcopy = 0
+            offset = 0
+            index += 1
+        if numplain > 0:
+            x += data[index : index + numplain]
+            index += numplain
+        while numcopy > 0:
+            x += bytes({x[-offset]})
+            numcopy -= 1
+        if limit and len(x) >= limit:
+            break
+    return x
+
+
+def make_resource(size: int, seed: int = 0) -> tuple[bytes, bytes]:
+    """Build a RefPack stream from random literal runs and back-references.
+
+    The stream mixes every kind of control code: 2 byte short copies, 3 byte medium copies and 4 byte long copies (each followed by up to 3 literal bytes), runs of 4 to 112 literal bytes, and the end of stream code. Short and medium copies are the most common, as they are in real packages.
+
+    Args:
+        size: Approximate uncompressed size of the resource.
+        seed: Seed for the random number generator.
+
+    Returns:
+        Compressed resource and its expected decompressed contents.
+    """
+    rng: random.Random = random.Random(seed)  # noqa: S311
+    body: bytearray = bytearray()
+    out: bytearray = bytearray()
+    while len(out) < size:
+        kind: str = rng.choices(CONTROL_MIX, CONTROL_WEIGHTS)[0] if out else "plain"
+        numplain: int = rng.randint(0, 3)
+        numcopy: int = 0
+        offset: int = 0
+        if kind == "short":
+            numcopy = rng.randint(3, 10)
+            offset = rng.randint(1, min(len(out), 1024))
+            body += bytes(
+                [
+                    (((offset - 1) >> 3) & 0x60) | ((numcopy - 3) << 2) | numplain,
+                    (offset - 1) & 0xFF,
+                ],
+            )
+        elif kind == "medium":
+            numcopy = rng.randint(4, 67)
+            offset = rng.randint(1, min(len(out), 16384))
+            body += bytes(
+                [
+                    0x80 | (numcopy - 4),
+                    (numplain << 6) | ((offset - 1) >> 8),
+                    (offset - 1) & 0xFF,
+                ],
+            )
+        elif kind == "long":
+            numcopy = rng.randint(5, 1028)
+            offset = rng.randint(1, min(len(out), 131072))
+            body += bytes(
+                [
+                    0xC0
+                    | (((offset - 1) >> 12) & 0x10)
+                    | (((numcopy - 5) >> 6) & 0x0C)
+                    | numplain,
+                    ((offset - 1) >> 8) & 0xFF,
+                    (offset - 1) & 0xFF,
+                    (numcopy - 5) & 0xFF,
+                ],
+            )
+        else:
+            numplain = rng.randint(1, 28) * 4
+            body.append(0xE0 + (numplain >> 2) - 1)
+
+        # literal bytes come before the copy, as the decompressor reads them first
+        plain: bytes = rng.randbytes(numplain)
+        body += plain
+        out += plain
+        for _ in range(numcopy):
+            out.append(out[-offset])
+
+    numplain = rng.randint(0, 3)
+    body.append(0xFC | numplain)
+    plain = rng.randbytes(numplain)
+    body += plain
+    out += plain
+
+    header: bytes = (len(body) + 9).to_bytes(4, byteorder="little")
+    header += b"\x10\xfb" + len(out).to_bytes(3, byteorder="big")
+    return header + bytes(body), bytes(out)
+
+
+def time_decompress(
+    func: Callable[[bytes], bytes],
+    data: bytes,
+    number: int,
+) -> tuple[float, bytes]:
+    """Time a decompressor.
+
+    Args:
+        func: Decompressor to time.
+        data: Compressed resource to decompress.
+        number: Number of times to decompress the resource.
+
+    Returns:
+        Average time per call in milliseconds and the decompressed contents.
+    """
+    result: bytes = b""
+    start: float = perf_counter()
+    for _ in range(number):
+        result = func(data)
+    return (perf_counter() - start) / number * 1000, result
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    label: str
+    size: int
+    for label, size in SIZES.items():
+        data: bytes
+        expected: bytes
+        data, expected = make_resource(size)
+
+        number: int = max(1, (1 << 16) // size)
+        old: float
+        new: float
+        old, old_result = time_decompress(legacy_decompress, data, number)
+        new, new_result = time_decompress(decompress, data, number)
+        assert old_result == new_result == expected  # noqa: S101
+
+        print(f"{label:>6}: {old:10.3f} ms -> {new:8.3f} ms ({old / new:.0f}x)")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
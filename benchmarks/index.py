@@ -0,0 +1,136 @@
+"""Micro-benchmark for filtering package indexes.
+
+Compares building a ResourceHeader for every entry and filtering them one by one
+with IndexTable masks on synthetic indexes of 1 000, 10 000 and 100 000 entries,
+and checks that both find the same resources. IndexTable uses NumPy if it is
+installed (pip install "sims2[fast]") and array columns otherwise, so run it
+with and without NumPy to compare both.
+
+Run with: python benchmarks/index.py
+"""  # noqa: INP001
+
+import random
+from collections.abc import Callable
+from time import perf_counter
+
+from sims2.dbpf import IndexTable, ResourceHeader, index
+
+SIZES: tuple[int, ...] = (1_000, 10_000, 100_000)
+RTYPES: tuple[bytes, ...] = (
+    b"NOCB",
+    b"VAHB",
+    b"SPZG",
+    b"#RTS",
+    b"SSTC",
+    b"DJBO",
+    b"fJBO",
+    b"RDI3",
+    b"CDMG",
+    b"NTHX",
+)
+GROUPS: tuple[bytes, ...] = (
+    b"\x00\x00\x00\x7f",
+    b"\x1c\x05\x00\x00",
+    b"\xff\xff\xff\xff",
+)
+
+
+def make_index(count: int, seed: int = 0) -> bytes:
+    """Build a package with an index of random 24 byte entries.
+
+    Args:
+        count: Number of entries in the index.
+        seed: Seed for the random number generator.
+
+    Returns:
+        Header and index of the package.
+    """
+    rng: random.Random = random.Random(seed)  # noqa: S311
+    header: bytearray = bytearray(96)
+    header[:4] = b"DBPF"
+    header[36:40] = count.to_bytes(4, byteorder="little")
+    header[40:44] = (96).to_bytes(4, byteorder="little")
+    header[44:48] = (count * 24).to_bytes(4, byteorder="little")
+    entries: bytearray = bytearray()
+    for _ in range(count):
+        entries += rng.choice(RTYPES)
+        entries += rng.choice(GROUPS)
+        entries += rng.randbytes(8)
+        entries += rng.randrange(1 << 31).to_bytes(4, byteorder="little")
+        entries += rng.randrange(1 << 16).to_bytes(4, byteorder="little")
+    return bytes(header + entries)
+
+
+def filter_headers(package: bytes) -> list[ResourceHeader]:
+    """Find resources by building a header for every entry, as before IndexTable.
+
+    Args:
+        package: Package to search.
+
+    Returns:
+        Headers of the matching resources.
+    """
+    count: int = int.from_bytes(package[36:40], byteorder="little")
+    headers: list[ResourceHeader] = [
+        ResourceHeader(package[96 + i * 24 : 120 + i * 24]) for i in range(count)
+    ]
+    return [
+        i for i in headers if i.rtype in {b"NOCB", b"SSTC"} and i.group == GROUPS[0]
+    ]
+
+
+def mask_headers(package: bytes) -> list[ResourceHeader]:
+    """Find resources with IndexTable masks.
+
+    Args:
+        package: Package to search.
+
+    Returns:
+        Headers of the matching resources.
+    """
+    table: IndexTable = IndexTable(package)
+    return table.headers(table.mask(rtypes=[b"NOCB", b"SSTC"], group=GROUPS[0]))
+
+
+def time_filter(
+    func: Callable[[bytes], list[ResourceHeader]],
+    package: bytes,
+    number: int,
+) -> tuple[float, list[bytes]]:
+    """Time a way of finding resources.
+
+    Args:
+        func: Function that finds the resources.
+        package: Package to search.
+        number: Number of times to search the package.
+
+    Returns:
+        Average time per call in milliseconds and the instances of the resources found.
+    """
+    result: list[ResourceHeader] = []
+    start: float = perf_counter()
+    for _ in range(number):
+        result = func(package)
+    return (perf_counter() - start) / number * 1000, [i.instance for i in result]
+
+
+def main() -> None:
+    """Run the benchmark and print timings."""
+    backend: str = "NumPy" if index.np is not None else "array"
+    count: int
+    for count in SIZES:
+        package: bytes = make_index(count)
+
+        number: int = max(1, 100_000 // count)
+        old: float
+        new: float
+        old, old_result = time_filter(filter_headers, package, number)
+        new, new_result = time_filter(mask_headers, package, number)
+        assert old_result == new_result  # noqa: S101
+
+        label: str = f"{count:>7} entries ({backend})"
+        print(f"{label}: {old:8.3f} ms -> {new:7.3f} ms ({old / new:.0f}x)")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
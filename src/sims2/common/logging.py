@@ -8,11 +8,14 @@ from pathlib import Path
 from types import TracebackType
 
 
-def config_logging(appname: str) -> None:
-    """Configure the logging system.
+def get_state_path(appname: str) -> Path:
+    """Get path to directory for logs and other persistent state.
 
     Args:
         appname: Name of tool being run.
+
+    Returns:
+        Path to state directory.
     """
     if "APPDATA" in os.environ:
         statehome: Path = Path(os.environ["APPDATA"])
@@ -21,12 +24,22 @@ def config_logging(appname: str) -> None:
     else:
         statehome = Path(os.environ["HOME"]) / ".local/state"
 
-    (statehome / appname).mkdir(parents=True, exist_ok=True)
+    path: Path = statehome / appname
+    path.mkdir(parents=True, exist_ok=True)
 
+    return path
+
+
+def config_logging(appname: str) -> None:
+    """Configure the logging system.
+
+    Args:
+        appname: Name of tool being run.
+    """
     logging.basicConfig(
         handlers=[
             RotatingFileHandler(
-                Path(statehome) / appname / "error.log",
+                get_state_path(appname) / "error.log",
                 delay=True,
                 maxBytes=100000,
                 backupCount=5,
@@ -1,15 +1,24 @@
 """Utilities for reading The Sims 2 dbpf (.package) files."""
 
+from .cache import CacheKey, ResourceCache, resource_cache
+from .index import IndexTable, get_headers
 from .utils import (
     LIMIT_FOR_CONFLICT,
+    Package,
     Resource,
     ResourceHeader,
-    get_headers,
+    decompress,
 )
 
 __all__ = [
     "LIMIT_FOR_CONFLICT",
+    "CacheKey",
+    "IndexTable",
+    "Package",
     "Resource",
+    "ResourceCache",
     "ResourceHeader",
+    "decompress",
     "get_headers",
+    "resource_cache",
 ]
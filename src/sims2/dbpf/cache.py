@@ -0,0 +1,106 @@
+"""Cache of decompressed resources shared by every package read in a process."""
+
+from collections import OrderedDict
+from threading import Lock
+
+# filepath, modification time (in ns), offset, and length of a resource
+type CacheKey = tuple[str, int, int, int]
+
+DEFAULT_BUDGET: int = 256 * 2**20
+
+
+class ResourceCache:
+    """Least recently used cache of decompressed resources.
+
+    Resources are evicted, least recently used first, once the total size of the cached resources exceeds the byte budget. Keys include the modification time of the file, so resources from a file that has since changed are never returned.
+
+    Attributes:
+        budget: Maximum total size in bytes of the cached resources.
+        size: Total size in bytes of the cached resources.
+        hits: Number of lookups that found a cached resource.
+        misses: Number of lookups that did not find a cached resource.
+        evictions: Number of resources evicted to stay within the budget.
+    """
+
+    def __init__(self, budget: int = DEFAULT_BUDGET) -> None:
+        """Initialize an empty cache.
+
+        Args:
+            budget: Maximum total size in bytes of the cached resources.
+        """
+        self.budget: int = budget
+        self.size: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._entries: OrderedDict[CacheKey, bytes] = OrderedDict()
+        self._lock: Lock = Lock()
+
+    def __len__(self) -> int:
+        """Get number of cached resources.
+
+        Returns:
+            Number of cached resources.
+        """
+        return len(self._entries)
+
+    def get(self, key: CacheKey) -> bytes | None:
+        """Get a cached resource, marking it as the most recently used.
+
+        Args:
+            key: Filepath, modification time, offset, and length of the resource.
+
+        Returns:
+            Decompressed contents of the resource, or None if it is not cached.
+        """
+        with self._lock:
+            contents: bytes | None = self._entries.get(key)
+            if contents is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return contents
+
+    def put(self, key: CacheKey, contents: bytes) -> None:
+        """Cache a resource, evicting the least recently used ones if over budget.
+
+        Args:
+            key: Filepath, modification time, offset, and length of the resource.
+            contents: Decompressed contents of the resource.
+        """
+        if len(contents) > self.budget:
+            return
+        with self._lock:
+            old: bytes | None = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self._entries[key] = contents
+            self.size += len(contents)
+            self._evict()
+
+    def resize(self, budget: int) -> None:
+        """Change the byte budget, evicting resources if the cache is now over it.
+
+        Args:
+            budget: Maximum total size in bytes of the cached resources.
+        """
+        with self._lock:
+            self.budget = budget
+            self._evict()
+
+    def _evict(self) -> None:
+        evicted: bytes
+        while self.size > self.budget:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every resource from the cache, keeping the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+resource_cache: ResourceCache = ResourceCache()
@@ -0,0 +1,199 @@
+"""Array-backed index table for The Sims 2 dbpf (.package) files."""
+
+import sys
+from array import array
+from collections.abc import Iterable
+from itertools import compress
+from typing import TYPE_CHECKING
+
+from .utils import Package, ResourceHeader, types2name
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from numpy import bool_, uint32, void
+    from numpy.typing import NDArray
+
+# unsigned integer NumPy array, or array of integers if NumPy is not installed
+type Column = NDArray[uint32] | array[int]
+# boolean NumPy array, or list of booleans if NumPy is not installed
+type Mask = NDArray[bool_] | list[bool]
+
+COLUMNS: tuple[str, ...] = ("rtype", "group", "instance", "classid", "index", "length")
+
+
+def _raw_types(rtype: bytes) -> set[int]:
+    raw: set[bytes] = {k for k, v in types2name.items() if v == rtype}
+    if rtype not in types2name:
+        raw.add(rtype)
+    return {int.from_bytes(i, byteorder="little") for i in raw}
+
+
+class IndexTable:
+    """Index of a dbpf file parsed into columns.
+
+    The whole index is parsed in one pass into NumPy structured arrays if NumPy is installed or array columns otherwise. Entries can then be filtered with masks over whole columns, and only entries that survive the masks become ResourceHeader objects.
+
+    Attributes:
+        count: Number of entries in the index.
+        step: Size of each entry in the index.
+    """
+
+    def __init__(self, package: Package | bytes) -> None:
+        """Parse the index of a package.
+
+        Args:
+            package: Dbpf file to parse the index of.
+        """
+        self.count: int = int.from_bytes(package[36:40], byteorder="little")
+        start: int = int.from_bytes(package[40:44], byteorder="little")
+        stop: int = start + int.from_bytes(package[44:48], byteorder="little")
+        self.step: int = int((stop - start) / self.count) if self.count else 24
+        self._raw: bytes = bytes(package[start : start + self.count * self.step])
+
+        offsets: list[int] = [0, 4, 8, 12, self.step - 8, self.step - 4]
+        min_step_for_classid = 24
+        if self.step < min_step_for_classid:
+            offsets[3] = -1
+
+        # columns are kept in _arrays if NumPy is installed and in _words otherwise
+        self._arrays: dict[str, NDArray[uint32]] = {}
+        self._words: dict[str, array[int]] = {}
+        if np is not None:
+            names: list[str] = [
+                i for i, j in zip(COLUMNS, offsets, strict=True) if j >= 0
+            ]
+            entries: NDArray[void] = np.frombuffer(
+                self._raw,
+                dtype=np.dtype(
+                    {
+                        "names": names,
+                        "formats": ["<u4" for _ in names],
+                        "offsets": [i for i in offsets if i >= 0],
+                        "itemsize": self.step,
+                    },
+                ),
+                count=self.count,
+            )
+            for name in COLUMNS:
+                self._arrays[name] = (
+                    entries[name] if name in names else np.zeros(self.count, "<u4")
+                )
+        else:
+            words: array[int] = array("I")
+            words.frombytes(self._raw)
+            if sys.byteorder == "big":
+                words.byteswap()
+            stride: int = self.step // 4
+            for name, offset in zip(COLUMNS, offsets, strict=True):
+                self._words[name] = (
+                    words[offset // 4 :: stride]
+                    if offset >= 0
+                    else array("I", bytes(4 * self.count))
+                )
+
+    def __len__(self) -> int:
+        """Get number of entries in the index.
+
+        Returns:
+            Number of entries.
+        """
+        return self.count
+
+    def column(self, name: str) -> Column:
+        """Get a column of the index.
+
+        Args:
+            name: Name of column (rtype, group, instance, classid, index, or length).
+
+        Returns:
+            Little-endian integer values of that field for every entry.
+        """
+        if np is not None:
+            return self._arrays[name]
+        return self._words[name]
+
+    def mask(
+        self,
+        *,
+        rtypes: Iterable[bytes] | None = None,
+        group: bytes | None = None,
+        group_high: int | None = None,
+        instance: bytes | None = None,
+    ) -> Mask:
+        """Get mask of entries matching filters.
+
+        Args:
+            rtypes: Types of resources to match.
+            group: Group of resources to match.
+            group_high: Value of the high byte of the group of resources to match.
+            instance: Instance of resources to match.
+
+        Returns:
+            Mask with a true value for each matching entry.
+        """
+        masks: list[Mask] = []
+        if rtypes is not None:
+            raw: set[int] = set[int]().union(*(_raw_types(i) for i in rtypes))
+            if np is not None:
+                masks.append(np.isin(self._arrays["rtype"], list(raw)))
+            else:
+                masks.append([i in raw for i in self._words["rtype"]])
+        if group is not None:
+            masks.append(self._equals("group", int.from_bytes(group, "little")))
+        if group_high is not None:
+            if np is not None:
+                masks.append((self._arrays["group"] >> 24) == group_high)
+            else:
+                masks.append([i >> 24 == group_high for i in self._words["group"]])
+        if instance is not None:
+            masks.append(self._equals("instance", int.from_bytes(instance, "little")))
+
+        if not masks:
+            return np.ones(self.count, bool) if np is not None else [True] * self.count
+        mask: Mask = masks[0]
+        for i in masks[1:]:
+            if isinstance(mask, list):
+                mask = [j and k for j, k in zip(mask, i, strict=True)]
+            else:
+                mask &= i
+        return mask
+
+    def _equals(self, name: str, value: int) -> Mask:
+        if np is not None:
+            return self._arrays[name] == value
+        return [i == value for i in self._words[name]]
+
+    def headers(self, mask: Mask | None = None) -> list[ResourceHeader]:
+        """Get headers of entries.
+
+        Args:
+            mask: Mask of entries to get headers for (all entries if not given).
+
+        Returns:
+            List of resource headers.
+        """
+        rows: Iterable[int]
+        if mask is None:
+            rows = range(self.count)
+        elif np is not None:
+            rows = np.flatnonzero(mask).tolist()
+        else:
+            rows = compress(range(self.count), mask)
+        step: int = self.step
+        return [ResourceHeader(self._raw[i * step : (i + 1) * step]) for i in rows]
+
+
+def get_headers(package: Package | bytes) -> list[ResourceHeader]:
+    """Get all headers in package.
+
+    Args:
+        package: Dbpf file to search for headers.
+
+    Returns:
+        List of resource headers.
+    """
+    return IndexTable(package).headers()
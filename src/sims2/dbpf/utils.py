@@ -1,7 +1,15 @@
 """Utilities for reading The Sims 2 dbpf (.package) files."""
 
+import os
 from binascii import hexlify
 from dataclasses import dataclass
+from mmap import ACCESS_READ, mmap
+from pathlib import Path
+from threading import Lock
+from types import TracebackType
+from typing import BinaryIO, Self, overload
+
+from .cache import CacheKey, resource_cache
 
 LIMIT_FOR_CONFLICT: int = 64
 
@@ -15,6 +23,124 @@ types2name: dict[bytes, bytes] = {
 }
 
 
+class Package:
+    """Dbpf file opened for reading.
+
+    By default the file is memory-mapped and slicing a package returns zero-copy memoryviews into the mapped file, so only the parts of the file that are actually read are loaded into memory.
+
+    A lazy package instead reads just the 96 byte header and the index when opened and fetches everything else on demand with positioned reads. This is faster for jobs that only need the index and a few bytes of each resource.
+
+    Attributes:
+        path: Filepath of the package.
+        mtime: Modification time of the package in nanoseconds when it was opened.
+    """
+
+    def __init__(self, path: Path | str, *, lazy: bool = False) -> None:
+        """Open a package.
+
+        Args:
+            path: Filepath of package to open.
+            lazy: Read only the header and index up front instead of memory-mapping the file.
+        """
+        self.path: Path = Path(path)
+        self._file: BinaryIO = self.path.open("rb")
+        stat: os.stat_result = os.fstat(self._file.fileno())
+        self._size: int = stat.st_size
+        self.mtime: int = stat.st_mtime_ns
+        self._mmap: mmap | None = None
+        self._lock: Lock = Lock()
+        self._parts: list[tuple[int, bytes]] = []
+
+        if lazy:
+            header: bytes = self._pread(0, 96)
+            start: int = int.from_bytes(header[40:44], byteorder="little")
+            size: int = int.from_bytes(header[44:48], byteorder="little")
+            self._parts = [(0, header), (start, self._pread(start, size))]
+        elif self._size > 0:
+            self._mmap = mmap(self._file.fileno(), 0, access=ACCESS_READ)
+        self._view: memoryview = memoryview(self._mmap or b"")
+
+    def __enter__(self) -> Self:
+        """Enter context manager.
+
+        Returns:
+            The package itself.
+        """
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        value: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        """Exit context manager, closing the package."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Get size of the package.
+
+        Returns:
+            Size of the package in bytes.
+        """
+        return self._size
+
+    @overload
+    def __getitem__(self, key: int) -> int: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> memoryview: ...
+
+    def __getitem__(self, key: int | slice) -> int | memoryview:
+        """Get part of the package without copying it.
+
+        Args:
+            key: Index or slice of package to get.
+
+        Returns:
+            Byte at index or memoryview of slice.
+        """
+        if self._mmap or not self._parts:
+            return self._view[key]
+
+        if isinstance(key, int):
+            return self[key : key + 1][0]
+        start: int
+        stop: int
+        start, stop, _ = key.indices(self._size)
+        stop = max(start, stop)
+
+        offset: int
+        part: bytes
+        for offset, part in self._parts:
+            if offset <= start and stop <= offset + len(part):
+                return memoryview(part)[start - offset : stop - offset]
+        return memoryview(self._pread(start, stop - start))
+
+    def _pread(self, offset: int, size: int) -> bytes:
+        if hasattr(os, "pread"):
+            return os.pread(self._file.fileno(), size, offset)
+        with self._lock:
+            _ = self._file.seek(offset)
+            return self._file.read(size)
+
+    def close(self) -> None:
+        """Close the package, unmapping the file if it was memory-mapped.
+
+        If slices of the package are still in use, the file is unmapped once the last of them is released instead, so they stay readable.
+        """
+        try:
+            self._view.release()
+            if self._mmap:
+                self._mmap.close()
+        except BufferError:
+            # the mapping is closed when the last slice of it is garbage collected
+            pass
+        finally:
+            self._mmap = None
+            self._file.close()
+
+
 @dataclass
 class ResourceHeader:
     """Class describing a resource within a dbpf file.
@@ -28,20 +154,20 @@ class ResourceHeader:
         length: Length of the resource.
     """
 
-    def __init__(self, header: bytes) -> None:
+    def __init__(self, header: bytes | memoryview) -> None:
         """Initialize a resource header from  bytes.
 
         Args:
             header: The raw resource header as seen in the dbpf file.
         """
-        self.rtype: bytes = header[:4]
+        self.rtype: bytes = bytes(header[:4])
         self.rtype = types2name.get(self.rtype, self.rtype)
-        self.group: bytes = header[4:8]
-        self.instance: bytes = header[8:12]
+        self.group: bytes = bytes(header[4:8])
+        self.instance: bytes = bytes(header[8:12])
 
         min_step_for_classid = 24
         if len(header) >= min_step_for_classid:
-            self.classid: bytes = header[12:16]
+            self.classid: bytes = bytes(header[12:16])
         else:
             self.classid = b"0x00"
 
@@ -57,20 +183,21 @@ class Resource:  # pylint: disable=too-few-public-methods
         group: Group containing the resource.
         instance: Instance of the resource.
         classid: Class ID (aka instance (high)) of the resource.
+        compressed: Whether the resource is compressed.
         contents: Contents of the resource.
         name: Name of the resource.
     """
 
     def __init__(
         self,
-        package: bytes,
+        package: Package | bytes,
         header: ResourceHeader,
         limit: float | None = None,
     ) -> None:
         """Initialize a resource within a package from its header.
 
         Args:
-            package: Contents of dbpf file containing resource.
+            package: Dbpf file containing resource.
             header: Header describing resource.
             limit: Limit on how much of the contents of the resource to store.
         """
@@ -79,15 +206,31 @@ class Resource:  # pylint: disable=too-few-public-methods
         self.instance: bytes = header.instance
         self.classid: bytes = header.classid
 
-        if limit == 0:
-            self.contents: bytes = package[header.index : header.index + 74]
+        if limit in {0, LIMIT_FOR_CONFLICT}:
+            data: bytes | memoryview = package[header.index : header.index + 74]
         else:
-            if limit == LIMIT_FOR_CONFLICT:
-                self.contents = package[header.index : header.index + 74]
+            data = package[header.index : header.index + header.length]
+        self.compressed: bool = (
+            int.from_bytes(data[:4], byteorder="little") == header.length
+        )
+        if limit != 0 and self.compressed:
+            if limit is None and isinstance(package, Package):
+                # only complete resources are cached
+                key: CacheKey = (
+                    str(package.path),
+                    package.mtime,
+                    header.index,
+                    header.length,
+                )
+                cached: bytes | None = resource_cache.get(key)
+                if cached is None:
+                    cached = decompress(data)
+                    resource_cache.put(key, cached)
+                self.contents: bytes = cached
             else:
-                self.contents = package[header.index : header.index + header.length]
-            if int.from_bytes(self.contents[:4], byteorder="little") == header.length:
-                self._decompress(limit)
+                self.contents = decompress(data, limit)
+        else:
+            self.contents = bytes(data)
 
         if limit == 0:
             self.name: str = ""
@@ -97,50 +240,6 @@ class Resource:  # pylint: disable=too-few-public-methods
             except UnicodeDecodeError:
                 self.name = ""
 
-    def _decompress(self, limit: float | None = None) -> None:
-        x: bytes = b""
-        index: int = 9
-        while index < len(self.contents):
-            if self.contents[index] < 128:  # noqa: PLR2004
-                control: bytes = self.contents[index : index + 2]
-                numplain: int = control[0] & 3
-                numcopy: int = ((control[0] & 28) >> 2) + 3
-                offset: int = ((control[0] & 96) << 3) + control[1] + 1
-                index += 2
-            elif self.contents[index] < 192:  # noqa: PLR2004
-                control = self.contents[index : index + 3]
-                numplain = ((control[1] & 192) >> 6) & 3
-                numcopy = (control[0] & 63) + 4
-                offset = ((control[1] & 63) << 8) + control[2] + 1
-                index += 3
-            elif self.contents[index] < 224:  # noqa: PLR2004
-                control = self.contents[index : index + 4]
-                numplain = control[0] & 3
-                numcopy = ((control[0] & 12) << 6) + control[3] + 5
-                offset = ((control[0] & 16) << 12) + (control[1] << 8) + control[2] + 1
-                index += 4
-            elif self.contents[index] < 252:  # noqa: PLR2004
-                control = self.contents[index : index + 1]
-                numplain = ((control[0] & 31) + 1) << 2
-                numcopy = 0
-                offset = 0
-                index += 1
-            else:
-                control = self.contents[index : index + 1]
-                numplain = control[0] & 3
-                numcopy = 0
-                offset = 0
-                index += 1
-            if numplain > 0:
-                x += self.contents[index : index + numplain]
-                index += numplain
-            while numcopy > 0:
-                x += bytes({x[-offset]})
-                numcopy -= 1
-            if limit and len(x) >= limit:
-                break
-        self.contents = x
-
     def print(self) -> str:
         """Get information about the resource in a printable string.
 
@@ -155,16 +254,71 @@ class Resource:  # pylint: disable=too-few-public-methods
         return chars
 
 
-def get_headers(package: bytes) -> list[ResourceHeader]:
-    """Get all headers in package.
+def decompress(data: bytes | memoryview, limit: float | None = None) -> bytes:  # noqa: C901
+    """Decompress a RefPack (aka QFS) compressed resource.
+
+    The output is written into a buffer preallocated from the uncompressed size in the RefPack header and back-references are copied in bulk, so decompression runs in linear time.
 
     Args:
-        package: Contents of dbpf file to search for headers.
+        data: Compressed resource, including its 9 byte header.
+        limit: Stop decompressing once at least this many bytes have been decompressed.
 
     Returns:
-        List of resource headers.
+        Decompressed contents of the resource.
+
+    Raises:
+        ValueError: If a back-reference points before the start of the output.
     """
-    start: int = int.from_bytes(package[40:44], byteorder="little")
-    stop: int = start + int.from_bytes(package[44:48], byteorder="little")
-    step: int = int((stop - start) / int.from_bytes(package[36:40], byteorder="little"))
-    return [ResourceHeader(package[x : x + step]) for x in range(start, stop, step)]
+    out: bytearray = bytearray(int.from_bytes(data[6:9], byteorder="big"))
+    pos: int = 0
+    index: int = 9
+    while index < len(data):
+        control: int = data[index]
+        if control < 128:  # noqa: PLR2004
+            numplain: int = control & 3
+            numcopy: int = ((control & 28) >> 2) + 3
+            offset: int = ((control & 96) << 3) + data[index + 1] + 1
+            index += 2
+        elif control < 192:  # noqa: PLR2004
+            numplain = ((data[index + 1] & 192) >> 6) & 3
+            numcopy = (control & 63) + 4
+            offset = ((data[index + 1] & 63) << 8) + data[index + 2] + 1
+            index += 3
+        elif control < 224:  # noqa: PLR2004
+            numplain = control & 3
+            numcopy = ((control & 12) << 6) + data[index + 3] + 5
+            offset = (
+                ((control & 16) << 12) + (data[index + 1] << 8) + data[index + 2] + 1
+            )
+            index += 4
+        elif control < 252:  # noqa: PLR2004
+            numplain = ((control & 31) + 1) << 2
+            numcopy = 0
+            offset = 0
+            index += 1
+        else:
+            numplain = control & 3
+            numcopy = 0
+            offset = 0
+            index += 1
+        if numplain > 0:
+            plain: bytes | memoryview = data[index : index + numplain]
+            out[pos : pos + len(plain)] = plain
+            pos += len(plain)
+            index += numplain
+        if numcopy > 0:
+            start: int = pos - offset
+            if start < 0:
+                msg = "back-reference before start of resource"
+                raise ValueError(msg)
+            if offset >= numcopy:
+                out[pos : pos + numcopy] = out[start : start + numcopy]
+            else:
+                out[pos : pos + numcopy] = (out[start:pos] * (numcopy // offset + 1))[
+                    :numcopy
+                ]
+            pos += numcopy
+        if limit and pos >= limit:
+            break
+    del out[pos:]
+    return bytes(out)
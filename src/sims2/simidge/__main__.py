@@ -1,30 +1,44 @@
 """A tool for searching in .package files."""
 
+import os
+import queue
+import time
 import tkinter as tk
 import tkinter.filedialog
 import tkinter.messagebox
 import tkinter.simpledialog
 import xml.etree.ElementTree as ET
 from binascii import unhexlify
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
 from dataclasses import dataclass
 from enum import Enum
+from functools import partial
 from logging import Logger, getLogger
 from pathlib import Path
 from typing import Any, Literal, override
 
-from sims2.common.logging import config_logging, handle_exception
-from sims2.dbpf import LIMIT_FOR_CONFLICT, ResourceHeader
+from sims2.common.logging import config_logging, get_state_path, handle_exception
+from sims2.dbpf import LIMIT_FOR_CONFLICT, ResourceHeader, resource_cache
 from sims2.simidge._config import config, save_config
+from sims2.simidge.catalog import LOWERCASE_TYPES, Catalog
 from sims2.simidge.search import (
     GROUP_PREFIX,
     CompResource,
     ResourceSearch,
+    SearchProgress,
+    Version,
 )
 
 logger: Logger = getLogger(__name__)
 
 INSTANCE_LENGTH: int = 8
 INSTANCE_LENGTH_SHORT: int = 4
+# seconds spent inserting results before handing control back to Tkinter
+RESULTS_CHUNK_TIME: float = 0.05
+# milliseconds between checks on the progress of a search
+PROGRESS_INTERVAL: int = 100
 
 
 @dataclass
@@ -69,7 +83,20 @@ class MainApp(tk.Frame):
 
         super().__init__(master)
 
-        self._add_menubar(master)
+        self.catalog: Catalog = Catalog(get_state_path("simidge") / "catalog.sqlite")
+        self.workers: int = (
+            config.getint("search", "workers", fallback=0) or os.cpu_count() or 1
+        )
+        resource_cache.resize(
+            config.getint("search", "cache_size", fallback=256) * 2**20,
+        )
+        self.content_index: bool = config.getboolean(
+            "search",
+            "content_index",
+            fallback=False,
+        )
+
+        self.menubar: tk.Menu = self._add_menubar(master)
 
         self.filter: SearchFilter = self._add_search_filter()
         self.var_file: tk.IntVar = self._add_searchtype_radio()
@@ -89,8 +116,18 @@ class MainApp(tk.Frame):
             state=tk.DISABLED,
         )
         self.button_clear.pack(side=tk.LEFT)
+        self.button_cancel: tk.Button = tk.Button(
+            frame_bottom,
+            text="Cancel",
+            command=self.cancel_search,
+            state=tk.DISABLED,
+        )
+        self.button_cancel.pack(side=tk.LEFT)
         frame_bottom.pack()
 
+        self.status: tk.Label = tk.Label(self)
+        self.status.pack()
+
         scrollbar: tk.Scrollbar = tk.Scrollbar(self)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
         self.search_results: tk.Text = tk.Text(
@@ -101,9 +138,19 @@ class MainApp(tk.Frame):
         self.search_results.pack()
         _ = scrollbar.config(command=self.search_results.yview)  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
 
+        self._results: Iterator[str] | None = None
+        self._results_job: str | None = None
+
+        # searches run one at a time in a worker thread so the window stays responsive
+        self._worker: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+        self._search: ResourceSearch | None = None
+        # resources of the running search already checked or listed while it runs
+        self._checked: int = 0
+        self._listed: set[int] = set()
+
         self.pack()
 
-    def _add_menubar(self, master: tk.Tk) -> None:
+    def _add_menubar(self, master: tk.Tk) -> tk.Menu:
         menubar: tk.Menu = tk.Menu()
         master["menu"] = menubar
         menufind: tk.Menu = tk.Menu(menubar, tearoff=False)
@@ -138,6 +185,8 @@ class MainApp(tk.Frame):
         menucompare.add_command(label="Resources", command=self.compare_resources)
         menubar.add_command(label="Settings", command=self.settings)
 
+        return menubar
+
     def _add_search_filter(
         self,
     ) -> SearchFilter:
@@ -235,17 +284,170 @@ class MainApp(tk.Frame):
 
     def clear_search_results(self) -> None:
         """Clear search results."""
+        self._stop_search_results()
         self.button_clear["state"] = tk.DISABLED
         self.search_results["state"] = tk.NORMAL
         self.search_results.delete("1.0", tk.END)
 
-    def print_search_results(self, chars: str) -> None:
-        """Print search results."""
+    def print_search_results(self, chars: str | Iterable[str]) -> None:
+        """Print search results.
+
+        Results given as an iterable are inserted a chunk at a time while Tkinter is idle, so the first results show right away and the window stays responsive.
+
+        Args:
+            chars: Search results, or an iterable of search results to print in order.
+        """
+        self._stop_search_results()
+        logger.debug(
+            "resource cache: %d hits, %d misses, %d evictions",
+            resource_cache.hits,
+            resource_cache.misses,
+            resource_cache.evictions,
+        )
         self.button_clear["state"] = tk.NORMAL
+        if isinstance(chars, str):
+            self._insert_search_results(chars)
+            return
+        self._results = iter(chars)
+        self._results_job = self.after_idle(self._print_search_results_chunk)
+
+    def _print_search_results_chunk(self) -> None:
+        self._results_job = None
+        if self._results is None:
+            return
+        chunk: list[str] = []
+        deadline: float = time.perf_counter() + RESULTS_CHUNK_TIME
+        for chars in self._results:
+            chunk.append(chars)
+            if time.perf_counter() >= deadline:
+                self._insert_search_results("".join(chunk))
+                self._results_job = self.after_idle(self._print_search_results_chunk)
+                return
+        self._results = None
+        self._insert_search_results("".join(chunk))
+
+    def _insert_search_results(self, chars: str) -> None:
         self.search_results["state"] = tk.NORMAL
         self.search_results.insert(tk.END, chars)
         self.search_results["state"] = tk.DISABLED
 
+    def _stop_search_results(self) -> None:
+        if self._results_job is not None:
+            self.after_cancel(self._results_job)
+            self._results_job = None
+        self._results = None
+
+    def run_search(
+        self,
+        resources: ResourceSearch,
+        scan: Callable[[], object],
+        results: Callable[[], str | Iterable[str]],
+        *,
+        min_files: int | None = 1,
+    ) -> None:
+        """Scan packages in a worker thread, showing progress until the results can be printed.
+
+        Resources are listed as soon as they have been found in min_files packages, then replaced by the full results once the scan has finished or been cancelled.
+
+        Args:
+            resources: ResourceSearch the scan adds resources to.
+            scan: Function scanning packages, which is run in the worker thread.
+            results: Function getting the results to print once the scan has finished or been cancelled.
+            min_files: Number of packages a resource must be found in to be listed while the scan is running (not listed if not given, for results that can't be known until the scan has finished).
+        """
+        progress: queue.Queue[SearchProgress] = queue.Queue()
+        resources.progress = progress.put
+        self._search = resources
+        self._checked = 0
+        self._listed = set()
+        self._set_searching(searching=True)
+        self.status["text"] = "Searching..."
+
+        future: Future[object] = self._worker.submit(scan)
+        _ = self.after(
+            PROGRESS_INTERVAL,
+            self._poll_search,
+            future,
+            progress,
+            results,
+            min_files,
+        )
+
+    def _poll_search(
+        self,
+        future: Future[object],
+        progress: queue.Queue[SearchProgress],
+        results: Callable[[], str | Iterable[str]],
+        min_files: int | None,
+    ) -> None:
+        latest: SearchProgress | None = None
+        with suppress(queue.Empty):
+            while True:
+                latest = progress.get_nowait()
+        if latest is not None:
+            self.status["text"] = (
+                f"{latest.files}/{latest.total} packages searched,"
+                f" {latest.size / 2**20:.1f} MB read, {latest.hits} resources found"
+            )
+
+        if not future.done():
+            if min_files is not None and self._search is not None:
+                self._list_found(self._search, min_files)
+            _ = self.after(
+                PROGRESS_INTERVAL,
+                self._poll_search,
+                future,
+                progress,
+                results,
+                min_files,
+            )
+            return
+
+        resources: ResourceSearch | None = self._search
+        self._search = None
+        self._set_searching(searching=False)
+        if self._listed:
+            self.clear_search_results()
+            self._listed = set()
+        if future.exception() is not None:
+            self.status["text"] = "Search failed."
+            _ = future.result()
+        if resources is not None and resources.cancelled:
+            self.status["text"] = "Search cancelled, showing partial results."
+        self.print_search_results(results())
+
+    def _list_found(self, resources: ResourceSearch, min_files: int) -> None:
+        chunk: list[str] = []
+        deadline: float = time.perf_counter() + RESULTS_CHUNK_TIME
+        resource: CompResource
+        for resource in resources.found(self._checked):
+            self._checked += 1
+            if id(resource) not in self._listed and len(resource.files) >= min_files:
+                self._listed.add(id(resource))
+                chunk.append(f"{resource.print()}\n")
+            if time.perf_counter() >= deadline:
+                # the rest are listed the next time progress is checked
+                break
+        if chunk:
+            self._insert_search_results("".join(chunk))
+
+    def _set_searching(self, *, searching: bool) -> None:
+        state: Literal["normal", "disabled"] = tk.DISABLED if searching else tk.NORMAL
+        _ = self.menubar.entryconfigure("Find", state=state)
+        _ = self.menubar.entryconfigure("Compare", state=state)
+        self.button_cancel["state"] = tk.NORMAL if searching else tk.DISABLED
+        if searching:
+            self.button_search["state"] = tk.DISABLED
+        else:
+            self._verify_filters()
+
+    def cancel_search(self) -> None:
+        """Cancel the running search, keeping the results found so far."""
+        if self._search is not None:
+            self._search.cancel.set()
+            self.button_cancel["state"] = tk.DISABLED
+            self.status["text"] = "Cancelling..."
+
     def find_conflicts(self) -> None:
         """Find conflicting mods in downloads folder."""
         self.clear_search_results()
@@ -253,14 +455,20 @@ class MainApp(tk.Frame):
         resources: ResourceSearch = ResourceSearch(
             [b"NOCB", b"VAHB", b"SPZG", b"BATT", b"sATT", b"#RTS", b"DJBO", b"fJBO"],
             filter_group=GROUP_PREFIX,
+            catalog=self.catalog,
         )
-        resources.search_folder(
-            config.get("paths", "downloads"),
-            limit=LIMIT_FOR_CONFLICT,
+        self.run_search(
+            resources,
+            partial(
+                resources.search_folder,
+                config.get("paths", "downloads"),
+                limit=LIMIT_FOR_CONFLICT,
+                workers=self.workers,
+            ),
+            partial(resources.iter_resources, min_files=2),
+            min_files=2,
         )
 
-        self.print_search_results(resources.print_resources(min_files=2))
-
     def find_conflicts_file(self) -> None:
         """Find mods conflicting with a selected package."""
         self.clear_search_results()
@@ -275,15 +483,21 @@ class MainApp(tk.Frame):
         resources: ResourceSearch = ResourceSearch(
             [b"NOCB", b"VAHB", b"BATT", b"sATT", b"#RTS", b"DJBO", b"fJBO"],
             filter_group=GROUP_PREFIX,
+            catalog=self.catalog,
         )
-        resources.search_folder(
-            config.get("paths", "downloads"),
-            limit=LIMIT_FOR_CONFLICT,
-            unique=False,
+        self.run_search(
+            resources,
+            partial(
+                resources.search_folder,
+                config.get("paths", "downloads"),
+                limit=LIMIT_FOR_CONFLICT,
+                unique=False,
+                workers=self.workers,
+            ),
+            partial(resources.iter_resources, min_files=2),
+            min_files=2,
         )
 
-        self.print_search_results(resources.print_resources(min_files=2))
-
     def find_conflicts_folder(self) -> None:
         """Find conflicting mods in selected folder."""
         self.clear_search_results()
@@ -291,16 +505,22 @@ class MainApp(tk.Frame):
         resources: ResourceSearch = ResourceSearch(
             [b"NOCB", b"VAHB", b"BATT", b"sATT", b"#RTS", b"DJBO", b"fJBO"],
             filter_group=GROUP_PREFIX,
+            catalog=self.catalog,
         )
-        resources.search_folder(
-            tkinter.filedialog.askdirectory(
-                initialdir=config.get("paths", "downloads"),
+        self.run_search(
+            resources,
+            partial(
+                resources.search_folder,
+                tkinter.filedialog.askdirectory(
+                    initialdir=config.get("paths", "downloads"),
+                ),
+                limit=LIMIT_FOR_CONFLICT,
+                workers=self.workers,
             ),
-            limit=LIMIT_FOR_CONFLICT,
+            partial(resources.iter_resources, min_files=2),
+            min_files=2,
         )
 
-        self.print_search_results(resources.print_resources(min_files=2))
-
     def find_dup_meshes(self) -> None:
         """Find duplicate meshes in downloads folder."""
         self.clear_search_results()
@@ -308,10 +528,19 @@ class MainApp(tk.Frame):
         resources: ResourceSearch = ResourceSearch(
             [b"CDMG"],
             filter_group=b"\x00\x00\x05\x1c",
+            catalog=self.catalog,
+        )
+        self.run_search(
+            resources,
+            partial(
+                resources.search_folder,
+                config.get("paths", "downloads"),
+                limit=0,
+                workers=self.workers,
+            ),
+            partial(resources.iter_resources, min_files=2),
+            min_files=2,
         )
-        resources.search_folder(config.get("paths", "downloads"), limit=0)
-
-        self.print_search_results(resources.print_resources(min_files=2))
 
     def find_translations(self) -> None:
         """Find string resources that have translations, empty strings, descriptions, or can otherwise be cleaned by SimPE."""
@@ -322,16 +551,23 @@ class MainApp(tk.Frame):
             filter_name=["Lua Scripts", "Lua Script", "More Lua Scripts"],
         )
 
-        rootdir: Path
-        files: list[str]
-        for rootdir, _, files in Path(config.get("paths", "downloads")).walk(
-            top_down=False,
-        ):
-            file: str
-            for file in (i for i in files if i[-8:].lower() == ".package"):
-                resources.search_strs(rootdir / file)
+        downloads: Path = Path(config.get("paths", "downloads"))
+
+        def search_strs() -> None:
+            paths: list[Path] = []
+            rootdir: Path
+            files: list[str]
+            for rootdir, _, files in downloads.walk(top_down=False):
+                paths += [rootdir / i for i in files if i[-8:].lower() == ".package"]
+            resources.total = len(paths)
 
-        self.print_search_results(resources.print_resources())
+            path: Path
+            for path in paths:
+                if resources.cancelled:
+                    break
+                resources.search_strs(path)
+
+        self.run_search(resources, search_strs, resources.iter_resources)
 
     def compare_packages(
         self,
@@ -353,19 +589,39 @@ class MainApp(tk.Frame):
         )
         if len(files) <= 1:
             return
-        file: str
-        for file in files:
-            resources.search_package(file, limit=limit)
 
-        self.print_search_results(
-            resources.print_resources(
+        # versions and the maximum number of files can only be checked once every
+        # package has been searched
+        listed: int | None = (
+            None if max_files or min_versions > 1 or max_versions else min_files
+        )
+        self.run_search(
+            resources,
+            partial(self._search_packages, resources, files, limit=limit),
+            partial(
+                resources.iter_resources,
                 min_files=min_files,
                 max_files=max_files,
                 min_versions=min_versions,
                 max_versions=max_versions,
             ),
+            min_files=listed,
         )
 
+    @staticmethod
+    def _search_packages(
+        resources: ResourceSearch,
+        files: Iterable[str],
+        limit: float | None = None,
+    ) -> None:
+        paths: list[str] = list(files)
+        resources.total = len(paths)
+        path: str
+        for path in paths:
+            if resources.cancelled:
+                break
+            resources.search_package(path, limit=limit)
+
     def compare_resources(self) -> None:
         """Compare selected resource with original copy in objects.package."""
         self.clear_search_results()
@@ -409,30 +665,27 @@ class MainApp(tk.Frame):
             filter_group=group,
             filter_instance=instance,
         )
-        _ = resources.append(
-            CompResource(
-                resource,
-                ResourceHeader(
-                    b"".join(
-                        [
-                            rtype,
-                            group,
-                            instance,
-                            classid,
-                            int().to_bytes(4, "little"),
-                            len(resource).to_bytes(4, "little"),
-                        ],
-                    ),
-                ),
+        header: ResourceHeader = ResourceHeader(
+            b"".join(
+                [
+                    rtype,
+                    group,
+                    instance,
+                    classid,
+                    int().to_bytes(4, "little"),
+                    len(resource).to_bytes(4, "little"),
+                ],
             ),
-            "",
-            resource,
         )
-
-        resources.search_package(config.get("paths", "objects"))
-
-        self.print_search_results(
-            resources.print_resource(rtype, group, classid, instance),
+        extracted: CompResource = CompResource(resource, header)
+        _ = resources.append(extracted, "", Version.of(path, header, extracted))
+
+        resources.total = 1
+        self.run_search(
+            resources,
+            partial(resources.search_package, config.get("paths", "objects")),
+            partial(resources.iter_resource, rtype, group, classid, instance),
+            min_files=None,
         )
 
     def _verify_filters(self, *_: Any) -> None:  # pyright: ignore[reportExplicitAny]
@@ -466,7 +719,7 @@ class MainApp(tk.Frame):
         target: str = self.filter.target.get()
         if not target:
             return None
-        if rtype in {b"#RTS", b"SSTC", b"sATT"}:
+        if rtype in LOWERCASE_TYPES:
             return target.lower().encode("utf-8")
         if len(target) % 2 != 0:
             self.filter.target.set("")
@@ -515,17 +768,35 @@ class MainApp(tk.Frame):
             filter_instance=filter_instance,
             filter_name=filter_name,
             target=target,
+            catalog=self.catalog
+            if self.var_file.get() == SearchType.DOWNLOADS.value
+            else None,
+            index=self.catalog
+            if self.content_index
+            and self.var_file.get()
+            in {SearchType.DOWNLOADS.value, SearchType.OBJECTS.value}
+            else None,
         )
 
         if self.var_file.get() == SearchType.FOLDER.value:
             folder: str = tkinter.filedialog.askdirectory()
             if not folder:
                 return
-            resources.search_folder(folder)
-            self.print_search_results(resources.print_resources())
+            self.run_search(
+                resources,
+                partial(resources.search_folder, folder, workers=self.workers),
+                resources.iter_resources,
+            )
         elif self.var_file.get() == SearchType.DOWNLOADS.value:
-            resources.search_folder(config.get("paths", "downloads"))
-            self.print_search_results(resources.print_resources())
+            self.run_search(
+                resources,
+                partial(
+                    resources.search_folder,
+                    config.get("paths", "downloads"),
+                    workers=self.workers,
+                ),
+                resources.iter_resources,
+            )
         elif self.var_file.get() == SearchType.FILES.value:
             files: tuple[str, ...] | Literal[""] = tkinter.filedialog.askopenfilenames(
                 initialdir=config.get("paths", "downloads"),
@@ -533,17 +804,18 @@ class MainApp(tk.Frame):
             if len(files) == 0:
                 return
 
-            file: str
-            for file in files:
-                resources.search_package(file)
-
-            if len(files) > 1:
-                self.print_search_results(resources.print_resources())
-            else:
-                self.print_search_results(resources.print_resources(printfiles=False))
+            self.run_search(
+                resources,
+                partial(self._search_packages, resources, files),
+                partial(resources.iter_resources, printfiles=len(files) > 1),
+            )
         else:
-            resources.search_package(config.get("paths", "objects"))
-            self.print_search_results(resources.print_resources(printfiles=False))
+            resources.total = 1
+            self.run_search(
+                resources,
+                partial(resources.search_package, config.get("paths", "objects")),
+                partial(resources.iter_resources, printfiles=False),
+            )
 
     def settings(self) -> None:
         """Open settings dialog for SiMidge."""
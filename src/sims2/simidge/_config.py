@@ -24,5 +24,10 @@ config: ConfigParser = load(
                 ),
             ),
         },
+        "search": {
+            "workers": "0",
+            "cache_size": "256",
+            "content_index": "false",
+        },
     },
 )
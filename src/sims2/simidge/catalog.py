@@ -0,0 +1,417 @@
+"""Persistent catalog of the resources in package files."""
+
+import os
+import sqlite3
+import threading
+from collections.abc import Collection, Iterable
+from logging import Logger, getLogger
+from pathlib import Path
+from typing import Any, NamedTuple, override
+
+from sims2.dbpf import (
+    LIMIT_FOR_CONFLICT,
+    IndexTable,
+    Package,
+    Resource,
+    ResourceHeader,
+)
+
+logger: Logger = getLogger(__name__)
+
+# version of the schema, stored in the database so outdated catalogs are rebuilt
+SCHEMA_VERSION: int = 2
+SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS packages (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    size INTEGER NOT NULL,
+    mtime INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS resources (
+    package INTEGER NOT NULL REFERENCES packages (id) ON DELETE CASCADE,
+    rtype BLOB NOT NULL,
+    grp BLOB NOT NULL,
+    instance BLOB NOT NULL,
+    classid BLOB NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    compressed INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS resources_package ON resources (package, rtype);
+CREATE TABLE IF NOT EXISTS indexed (
+    package INTEGER NOT NULL REFERENCES packages (id) ON DELETE CASCADE,
+    rtype BLOB NOT NULL,
+    PRIMARY KEY (package, rtype)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS trigrams (
+    package INTEGER NOT NULL REFERENCES packages (id) ON DELETE CASCADE,
+    offset INTEGER NOT NULL,
+    signature BLOB NOT NULL,
+    PRIMARY KEY (package, offset)
+) WITHOUT ROWID;
+"""
+
+# types of resources whose contents are searched without regard to case
+LOWERCASE_TYPES: frozenset[bytes] = frozenset({b"#RTS", b"SSTC", b"sATT"})
+
+# bounds on the number of bits in a trigram signature, which grows with the resource
+_SIGNATURE_MIN_BITS: int = 64
+_SIGNATURE_MAX_BITS: int = 2**16
+# signature of contents that couldn't be read, which may contain any target
+_UNKNOWN_SIGNATURE: bytes = b"\xff" * (_SIGNATURE_MIN_BITS // 8)
+
+
+def _trigrams(data: bytes) -> set[int]:
+    return {
+        x << 16 | y << 8 | z for x, y, z in zip(data, data[1:], data[2:], strict=False)
+    }
+
+
+def _bits(trigrams: set[int], shift: int) -> set[int]:
+    # multiplicative hash, keeping the top bits so every byte of the trigram counts
+    return {(i * 0x9E3779B1 & 0xFFFFFFFF) >> shift for i in trigrams}
+
+
+def trigram_signature(contents: bytes) -> bytes:
+    """Get the trigram signature of the contents of a resource.
+
+    The signature is a bit array with a bit set for every 3 byte sequence in the contents, sized for about 8 bits per distinct sequence, so a target can only be in the contents if every bit for the sequences in the target is set.
+
+    Args:
+        contents: Contents of the resource.
+
+    Returns:
+        Trigram signature of the contents.
+    """
+    trigrams: set[int] = _trigrams(contents)
+    bits: int = min(
+        max(1 << (len(trigrams) * 8 - 1).bit_length(), _SIGNATURE_MIN_BITS),
+        _SIGNATURE_MAX_BITS,
+    )
+    shift: int = 33 - bits.bit_length()
+    signature: bytearray = bytearray(bits // 8)
+    bit: int
+    for bit in _bits(trigrams, shift):
+        signature[bit >> 3] |= 1 << (bit & 7)
+    return bytes(signature)
+
+
+def may_contain(signature: bytes, target: bytes) -> bool:
+    """Check if contents with a trigram signature may contain a target.
+
+    Args:
+        signature: Trigram signature of the contents.
+        target: Bytes to search for, at least 3 bytes long.
+
+    Returns:
+        False if the contents can't contain the target, otherwise true (even if they don't actually contain it).
+    """
+    shift: int = 33 - (len(signature) * 8).bit_length()
+    return all(
+        signature[i >> 3] >> (i & 7) & 1 for i in _bits(_trigrams(target), shift)
+    )
+
+
+class CatalogEntry(NamedTuple):
+    """Resource recorded in the catalog.
+
+    Attributes:
+        rtype: Type of resource.
+        group: Group containing the resource.
+        instance: Instance of the resource.
+        classid: Class ID (aka instance (high)) of the resource.
+        offset: Location of the resource within package.
+        length: Length of the resource.
+        compressed: Whether the resource is compressed.
+        name: Name of the resource.
+    """
+
+    rtype: bytes
+    group: bytes
+    instance: bytes
+    classid: bytes
+    offset: int
+    length: int
+    compressed: bool
+    name: str
+
+
+class Catalog:
+    """Persistent catalog of the resources in package files.
+
+    Each package's index entries and resource names are stored in an SQLite database keyed by the package's path, size, and modification time, so a package only needs to be parsed again once it has changed. Parsing a package only reads its index and the start of each resource.
+
+    The catalog can also keep a trigram signature of the decompressed contents of each resource of the types searched for with a target, so later searches for any target only decompress the resources that may contain it. Signatures of strings are taken from their lowercased contents, as strings are searched without regard to case.
+
+    Attributes:
+        path: Filepath of the catalog database.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """Initialize a catalog stored in a database.
+
+        Args:
+            path: Filepath of the catalog database.
+        """
+        self.path: Path = Path(path)
+        self._local: threading.local = threading.local()
+
+    @override
+    def __getstate__(self) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        """Get state for pickling, leaving out open database connections.
+
+        Returns:
+            State of the catalog.
+        """
+        return {"path": self.path}
+
+    def __setstate__(self, state: dict[str, Any]) -> None:  # pyright: ignore[reportExplicitAny]
+        """Restore state after unpickling.
+
+        Args:
+            state: State of the catalog.
+        """
+        self.path = state["path"]
+        self._local = threading.local()
+
+    def _connect(self) -> sqlite3.Connection:
+        con: sqlite3.Connection | None = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=60)
+            _ = con.execute("PRAGMA journal_mode = WAL")
+            _ = con.execute("PRAGMA foreign_keys = ON")
+            self._migrate(con)
+            self._local.con = con
+        return con
+
+    @staticmethod
+    def _migrate(con: sqlite3.Connection) -> None:
+        # the catalog is only a cache, so an outdated one is rebuilt from scratch
+        _ = con.execute("BEGIN IMMEDIATE")
+        try:
+            if con.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                table: str
+                for table in ("trigrams", "indexed", "resources", "packages"):
+                    _ = con.execute(f"DROP TABLE IF EXISTS {table}")
+                _ = con.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+            statement: str
+            for statement in SCHEMA.split(";"):
+                _ = con.execute(statement)
+        except BaseException:
+            con.rollback()
+            raise
+        con.commit()
+
+    def entries(
+        self,
+        path: Path,
+        rtypes: Collection[bytes] | None = None,
+    ) -> list[CatalogEntry]:
+        """Get the resources in a package, parsing it first if it is not up to date in the catalog.
+
+        Args:
+            path: Filepath of package.
+            rtypes: Types of resources to get (all types if not given).
+
+        Returns:
+            List of resources in the order they appear in the package's index.
+        """
+        con: sqlite3.Connection = self._connect()
+        package_id: int = self._package_id(con, path)
+
+        query: str = (
+            "SELECT rtype, grp, instance, classid, offset, length, compressed, name"
+            " FROM resources WHERE package = ?"
+        )
+        params: list[int | bytes] = [package_id]
+        if rtypes is not None:
+            query += f" AND rtype IN ({', '.join('?' for _ in rtypes)})"
+            params += rtypes
+        query += " ORDER BY rowid"
+        cursor: sqlite3.Cursor = con.execute(query, params)
+        rows: list[tuple[bytes, bytes, bytes, bytes, int, int, int, str]] = (
+            cursor.fetchall()
+        )
+        return [
+            CatalogEntry(
+                rtype,
+                group,
+                instance,
+                classid,
+                offset,
+                length,
+                bool(compressed),
+                name,
+            )
+            for rtype, group, instance, classid, offset, length, compressed, name in rows
+        ]
+
+    def _package_id(self, con: sqlite3.Connection, path: Path) -> int:
+        stat: os.stat_result = path.stat()
+        row: tuple[int, int, int] | None = con.execute(
+            "SELECT id, size, mtime FROM packages WHERE path = ?",
+            (str(path),),
+        ).fetchone()
+        if row is None or row[1:] != (stat.st_size, stat.st_mtime_ns):
+            return self._update(con, path, stat)
+        return row[0]
+
+    def candidates(
+        self,
+        path: Path,
+        rtypes: Collection[bytes],
+        target: bytes,
+    ) -> set[int] | None:
+        """Find the resources in a package that may contain a target, indexing their contents first if they are not up to date in the catalog.
+
+        Args:
+            path: Filepath of package.
+            rtypes: Types of resources to search.
+            target: Bytes to search for (lowercased for strings).
+
+        Returns:
+            Locations within the package of the resources that may contain the target, or None if the target is too short to be looked up.
+        """
+        if len(target) < 3:  # noqa: PLR2004
+            return None
+
+        con: sqlite3.Connection = self._connect()
+        package_id: int = self._package_id(con, path)
+        indexed: set[bytes] = {
+            i
+            for (i,) in con.execute(
+                "SELECT rtype FROM indexed WHERE package = ?",
+                (package_id,),
+            )
+        }
+        missing: list[bytes] = [i for i in rtypes if i not in indexed]
+        if missing:
+            self._index(con, package_id, path, missing)
+
+        query: str = (
+            "SELECT resources.offset, signature FROM resources JOIN trigrams"
+            " ON trigrams.package = resources.package"
+            " AND trigrams.offset = resources.offset WHERE resources.package = ?"
+        )
+        query += f" AND rtype IN ({', '.join('?' for _ in rtypes)})"
+        return {
+            offset
+            for offset, signature in con.execute(query, (package_id, *rtypes))
+            if may_contain(signature, target)
+        }
+
+    @staticmethod
+    def _index(
+        con: sqlite3.Connection,
+        package_id: int,
+        path: Path,
+        rtypes: list[bytes],
+    ) -> None:
+        logger.debug("indexing file: %s", path.name)
+        signatures: list[tuple[int, bytes]] = []
+        with Package(path) as package:
+            if int.from_bytes(package[36:40], byteorder="little") != 0:
+                table: IndexTable = IndexTable(package)
+                header: ResourceHeader
+                for header in table.headers(table.mask(rtypes=rtypes)):
+                    try:
+                        contents: bytes = Resource(package, header).contents
+                    except (IndexError, ValueError):
+                        # leave it to the search to fail on the resource as before
+                        signatures.append((header.index, _UNKNOWN_SIGNATURE))
+                        continue
+                    if header.rtype in LOWERCASE_TYPES:
+                        contents = contents.lower()
+                    signatures.append((header.index, trigram_signature(contents)))
+        with con:
+            _ = con.executemany(
+                "INSERT OR REPLACE INTO trigrams VALUES (?, ?, ?)",
+                ((package_id, *i) for i in signatures),
+            )
+            _ = con.executemany(
+                "INSERT OR IGNORE INTO indexed VALUES (?, ?)",
+                ((package_id, i) for i in rtypes),
+            )
+
+    def _update(self, con: sqlite3.Connection, path: Path, stat: os.stat_result) -> int:
+        logger.debug("cataloging file: %s", path.name)
+        entries: list[CatalogEntry] = self.parse(path)
+        with con:
+            _ = con.execute("DELETE FROM packages WHERE path = ?", (str(path),))
+            package_id: int = con.execute(
+                "INSERT INTO packages (path, size, mtime) VALUES (?, ?, ?) RETURNING id",
+                (str(path), stat.st_size, stat.st_mtime_ns),
+            ).fetchone()[0]
+            _ = con.executemany(
+                "INSERT INTO resources VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                ((package_id, *i) for i in entries),
+            )
+        return package_id
+
+    @staticmethod
+    def parse(path: Path) -> list[CatalogEntry]:
+        """Parse the resources in a package.
+
+        Args:
+            path: Filepath of package.
+
+        Returns:
+            List of resources in the order they appear in the package's index.
+        """
+        entries: list[CatalogEntry] = []
+        with Package(path, lazy=True) as package:
+            if int.from_bytes(package[36:40], byteorder="little") == 0:
+                return entries
+
+            header: ResourceHeader
+            for header in IndexTable(package).headers():
+                try:
+                    resource: Resource = Resource(package, header, LIMIT_FOR_CONFLICT)
+                    compressed: bool = resource.compressed
+                    name: str = resource.name
+                except (IndexError, ValueError):
+                    compressed = (
+                        int.from_bytes(
+                            package[header.index : header.index + 4],
+                            byteorder="little",
+                        )
+                        == header.length
+                    )
+                    name = ""
+                entries.append(
+                    CatalogEntry(
+                        header.rtype,
+                        header.group,
+                        header.instance,
+                        header.classid,
+                        header.index,
+                        header.length,
+                        compressed,
+                        name,
+                    ),
+                )
+        return entries
+
+    def prune(self, folder: Path, paths: Iterable[Path]) -> None:
+        """Remove packages in a folder that no longer exist from the catalog.
+
+        Args:
+            folder: Folder that was searched.
+            paths: Filepaths of packages that were found in the folder.
+        """
+        con: sqlite3.Connection = self._connect()
+        found: set[str] = {str(i) for i in paths}
+        prefix: str = os.path.join(folder, "")  # noqa: PTH118
+        with con:
+            _ = con.executemany(
+                "DELETE FROM packages WHERE path = ?",
+                (
+                    (i,)
+                    for (i,) in con.execute(
+                        "SELECT path FROM packages WHERE substr(path, 1, ?) = ?",
+                        (len(prefix), prefix),
+                    ).fetchall()
+                    if i not in found
+                ),
+            )
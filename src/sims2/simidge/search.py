@@ -1,15 +1,122 @@
 """Search package for resources matching filters."""
 
+import os
+import threading
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import closing, suppress
+from hashlib import blake2b
+from itertools import repeat
 from logging import Logger, getLogger
+from multiprocessing import get_context
 from pathlib import Path
-
-from sims2.dbpf import Resource, ResourceHeader, get_headers
+from typing import Any, NamedTuple, Self, override
+
+from sims2.dbpf import (
+    LIMIT_FOR_CONFLICT,
+    CacheKey,
+    IndexTable,
+    Package,
+    Resource,
+    ResourceHeader,
+    decompress,
+    resource_cache,
+)
+from sims2.simidge.catalog import LOWERCASE_TYPES, Catalog, CatalogEntry
 
 logger: Logger = getLogger(__name__)
 
 GROUP_PREFIX: bytes = b"0x7F"
 
 
+class SearchProgress(NamedTuple):
+    """Progress of a search through packages.
+
+    Attributes:
+        files: Number of packages searched so far.
+        total: Number of packages expected to be searched.
+        size: Size of the packages searched so far, in bytes.
+        hits: Number of resources found so far.
+    """
+
+    files: int
+    total: int
+    size: int
+    hits: int
+
+
+class Version(NamedTuple):
+    """Location of a version of a resource, so its contents can be read again when needed.
+
+    Attributes:
+        path: Filepath of the file containing this version.
+        offset: Location of this version within the file.
+        length: Length of this version as stored in the file.
+        compressed: Whether this version is compressed.
+    """
+
+    path: Path
+    offset: int
+    length: int
+    compressed: bool
+
+    @classmethod
+    def of(cls, path: Path, header: ResourceHeader, resource: Resource) -> Self:
+        """Get the version of a resource read from a file.
+
+        Args:
+            path: Filepath of the file the resource was read from.
+            header: Header describing the resource.
+            resource: Resource read from the file.
+
+        Returns:
+            Version of the resource.
+        """
+        return cls(path, header.index, header.length, resource.compressed)
+
+    def digest(self) -> bytes:
+        """Hash the decompressed contents of this version.
+
+        Versions are only hashed when they are compared, however the resource was found, so searches that don't compare versions never read more of a resource than they need.
+
+        Returns:
+            Hash of the contents of this version.
+        """
+        return blake2b(read_version(self), digest_size=16).digest()
+
+
+def read_version(version: Version) -> bytes:
+    """Read the contents of a version of a resource.
+
+    Compressed versions are decompressed through the shared resource cache, so comparing versions does not decompress the same resource again and again.
+
+    Args:
+        version: Version to read.
+
+    Returns:
+        Contents of the version.
+    """
+    with version.path.open("rb") as file:
+        key: CacheKey = (
+            str(version.path),
+            os.fstat(file.fileno()).st_mtime_ns,
+            version.offset,
+            version.length,
+        )
+        if version.compressed:
+            cached: bytes | None = resource_cache.get(key)
+            if cached is not None:
+                return cached
+        logger.debug("reading file: %s", version.path.name)
+        _ = file.seek(version.offset)
+        data: bytes = file.read(version.length)
+    if not version.compressed:
+        return data
+    contents: bytes = decompress(data)
+    resource_cache.put(key, contents)
+    return contents
+
+
 class CompResource(Resource):
     """Resource inside a dbpf file.
 
@@ -21,35 +128,60 @@ class CompResource(Resource):
         contents: Contents of the resource.
         name: Name of the resource.
         files: List of filenames that the resource is found in.
-        versions: List of contents of the resource in each file it is found in.
+        versions: List of locations of the resource in each file it is found in.
     """
 
     def __init__(
         self,
-        package: bytes,
+        package: Package | bytes,
         header: ResourceHeader,
         limit: float | None = None,
     ) -> None:
         """Initialize a resource within a package from its header.
 
         Args:
-            package: Contents of dbpf file containing resource.
+            package: Dbpf file containing resource.
             header: Header describing resource.
             limit: Limit on how much of the contents of the resource to store.
         """
         super().__init__(package, header, limit)
         self.files: list[str] = []
-        self.versions: list[bytes] = []
+        self.versions: list[Version] = []
+
+    @classmethod
+    def from_entry(cls, entry: CatalogEntry, limit: float | None = None) -> Self:
+        """Initialize a resource from its catalog entry without reading its package.
 
-    def add_version(self, filename: str, resource: bytes) -> None:
+        The contents of the resource are not read, so they are left empty.
+
+        Args:
+            entry: Catalog entry describing resource.
+            limit: Limit on how much of the contents of the resource to store.
+
+        Returns:
+            Resource described by the catalog entry.
+        """
+        resource: Self = cls.__new__(cls)
+        resource.rtype = entry.rtype
+        resource.group = entry.group
+        resource.instance = entry.instance
+        resource.classid = entry.classid
+        resource.compressed = entry.compressed
+        resource.contents = b""
+        resource.name = "" if limit == 0 else entry.name
+        resource.files = []
+        resource.versions = []
+        return resource
+
+    def add_version(self, filename: str, version: Version) -> None:
         """Add a version of the resource found in filename.
 
         Args:
             filename: Name of file this version was found in.
-            resource: Contents of resource in that file.
+            version: Location of resource in that file.
         """
         self.files.append(filename)
-        self.versions.append(resource)
+        self.versions.append(version)
 
     def print_files(self) -> str:
         """Get information about the files the resource was found in.
@@ -57,10 +189,17 @@ class CompResource(Resource):
         Returns:
             String describing files the resource is found in.
         """
-        chars: str = "Packages Using This Procedure:\n"
+        return "".join(self.iter_files())
+
+    def iter_files(self) -> Generator[str]:
+        """Get information about the files the resource was found in line by line.
+
+        Yields:
+            Each line describing files the resource is found in.
+        """
+        yield "Packages Using This Procedure:\n"
         for i in self.files:
-            chars += f"\t{i}\n"
-        return chars
+            yield f"\t{i}\n"
 
     def print_versions(self) -> str:
         """Get information about the differences in versions of the resource.
@@ -68,28 +207,35 @@ class CompResource(Resource):
         Returns:
             String describing the differences in versions of the reource.
         """
+        return "".join(self.iter_versions())
+
+    def iter_versions(self) -> Generator[str]:
+        """Get information about the differences in versions of the resource line by line.
+
+        Yields:
+            Each line describing the differences in versions of the resource.
+        """
         if len(self.versions) <= 1:
-            return "No differences found."
-        if len(self.versions[0]) > len(self.versions[1]):
-            size: int = len(self.versions[1])
-        else:
-            size = len(self.versions[0])
+            yield "No differences found."
+            return
+        first: bytes = read_version(self.versions[0])
+        second: bytes = read_version(self.versions[1])
+        size: int = min(len(first), len(second))
         if self.rtype == b"NOCB":
             index: int = 66
         else:
             index = 64
 
-        chars: str = "Changed Lines:\n"
+        yield "Changed Lines:\n"
         for i in range(index, size, 2):
-            x: int = int.from_bytes(self.versions[0][i : i + 2], byteorder="little")
+            x: int = int.from_bytes(first[i : i + 2], byteorder="little")
             if x >= 2**15:
                 x -= 2**16 - 1
-            y: int = int.from_bytes(self.versions[1][i : i + 2], byteorder="little")
+            y: int = int.from_bytes(second[i : i + 2], byteorder="little")
             if y >= 2**15:
                 y -= 2**16 - 1
             if x != y:
-                chars += f"Line:\t{(i - index) // 2}\tValue:\t{y}\t->\t{x}\n"
-        return chars
+                yield f"Line:\t{(i - index) // 2}\tValue:\t{y}\t->\t{x}\n"
 
 
 class ResourceSearch:
@@ -100,9 +246,14 @@ class ResourceSearch:
         filter_instance: Instance of resources to search for.
         filter_name: String to search for in resource names.
         target: String to search for in resource contents.
+        catalog: Catalog to read packages' resources from when their contents are not needed.
+        index: Catalog to look up which resources may contain the target in, so only those are read.
+        progress: Function called with the progress of the search each time a package has been searched.
+        cancel: Event that stops the search once it is set (from any thread), keeping the resources found so far.
+        total: Number of packages expected to be searched, as reported in the progress of the search.
     """
 
-    def __init__(
+    def __init__(  # noqa: PLR0913
         self,
         filter_type: list[bytes],
         *,
@@ -110,6 +261,8 @@ class ResourceSearch:
         filter_instance: bytes | None = None,
         filter_name: str | list[str] | None = None,
         target: bytes | None = None,
+        catalog: Catalog | None = None,
+        index: Catalog | None = None,
     ) -> None:
         """Initialize a ResourceSearch object.
 
@@ -119,18 +272,71 @@ class ResourceSearch:
             filter_instance: Instance of resources to search for.
             filter_name: String to search for in resource names.
             target: String to search for in resource contents.
+            catalog: Catalog to read packages' resources from when their contents are not needed.
+            index: Catalog to look up which resources may contain the target in, so only those are read.
         """
-        self._dict: dict[
-            bytes,
-            dict[bytes, dict[bytes, dict[bytes, CompResource]]],
-        ] = {}
-        for rtype in filter_type:
-            self._dict[rtype] = {}
+        # position of each type in the filter, which becomes the top bits of its keys
+        self._types: dict[bytes, int] = {
+            rtype: i for i, rtype in enumerate(dict.fromkeys(filter_type))
+        }
+        self._resources: dict[int, CompResource] = {}
+        self._order: list[CompResource] | None = None
+        # each resource every time it is found in a file, only ever appended to so it
+        # can be read from other threads while the search is running
+        self._found: list[CompResource] = []
 
         self.filter_group: bytes | None = filter_group
         self.filter_instance: bytes | None = filter_instance
         self.filter_name: str | list[str] | None = filter_name
         self.target: bytes | None = target
+        self.catalog: Catalog | None = catalog
+        self.index: Catalog | None = index
+
+        self.progress: Callable[[SearchProgress], object] | None = None
+        self.cancel: threading.Event = threading.Event()
+        self.total: int = 0
+        self._files: int = 0
+        self._size: int = 0
+
+    @override
+    def __getstate__(self) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+        """Get state for pickling, leaving out the progress function and cancel event, which only work in the process they were created in.
+
+        Returns:
+            State of the search.
+        """
+        return {
+            k: v for k, v in self.__dict__.items() if k not in {"progress", "cancel"}
+        }
+
+    def __setstate__(self, state: dict[str, Any]) -> None:  # pyright: ignore[reportExplicitAny]
+        """Restore state after unpickling.
+
+        Args:
+            state: State of the search.
+        """
+        self.__dict__.update(state)
+        self.progress = None
+        self.cancel = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether the search has been cancelled."""
+        return self.cancel.is_set()
+
+    def _searched(self, path: Path) -> None:
+        self._files += 1
+        with suppress(OSError):
+            self._size += path.stat().st_size
+        if self.progress is not None:
+            _ = self.progress(
+                SearchProgress(
+                    self._files,
+                    self.total,
+                    self._size,
+                    len(self._resources),
+                ),
+            )
 
     def validate_group(self, group: bytes) -> bool:
         """Check if group satisfies search parameters.
@@ -160,6 +366,30 @@ class ResourceSearch:
         """
         return not (self.filter_instance and instance != self.filter_instance)
 
+    def get_headers(self, package: Package | bytes) -> list[ResourceHeader]:
+        """Get headers in package that satisfy the type, group, and instance filters.
+
+        Args:
+            package: Dbpf file to search for headers.
+
+        Returns:
+            List of resource headers.
+        """
+        table: IndexTable = IndexTable(package)
+        group: bytes | None = self.filter_group or None
+        group_high: int | None = None
+        if group == GROUP_PREFIX:
+            group = None
+            group_high = int(GROUP_PREFIX, 0)
+        return table.headers(
+            table.mask(
+                rtypes=self._types,
+                group=group,
+                group_high=group_high,
+                instance=self.filter_instance or None,
+            ),
+        )
+
     def validate_resource(self, resource: Resource) -> bool:
         """Check if resource contents and name satisfies search parameters.
 
@@ -170,7 +400,7 @@ class ResourceSearch:
             Satisfies search parameters or not.
         """
         if self.target:
-            if resource.rtype in {b"#RTS", b"SSTC", b"sATT"}:
+            if resource.rtype in LOWERCASE_TYPES:
                 if self.target not in resource.contents.lower():
                     return False
             elif self.target not in resource.contents:
@@ -189,6 +419,7 @@ class ResourceSearch:
         limit: float | None = None,
         *,
         unique: bool = True,
+        workers: int | None = None,
     ) -> None:
         """Search folder for packages and their resources.
 
@@ -196,16 +427,53 @@ class ResourceSearch:
             folder: Folder to search for.
             limit: Limit on how much of the contents of the resource to store.
             unique: Allow adding new resources not already in the ResourceSearch (versus just new versions of existing resources).
+            workers: Number of processes to search packages with (searches in this process if not given).
+
+        If the search is cancelled, packages that have not been searched yet are skipped and the catalog is left as it was.
         """
         if isinstance(folder, str):
             folder = Path(folder)
 
+        paths: list[Path] = []
         rootdir: Path
         files: list[str]
         for rootdir, _, files in folder.walk(top_down=False):
-            file: str
-            for file in (i for i in files if i[-8:].lower() == ".package"):
-                self.search_package(rootdir / file, limit=limit, unique=unique)
+            paths += [rootdir / i for i in files if i[-8:].lower() == ".package"]
+        self.total += len(paths)
+
+        path: Path
+        if workers is not None and workers > 1 and len(paths) > 1:
+            # results are merged in the same order as a serial search, and workers are
+            # spawned as searches may run in a thread, which is not safe to fork from
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=get_context("spawn"),
+            ) as executor:
+                resources: list[tuple[CompResource, Version]]
+                for path, resources in zip(
+                    paths,
+                    executor.map(
+                        _find_resources,
+                        repeat(self._copy_filters()),
+                        paths,
+                        repeat(limit),
+                        chunksize=max(1, len(paths) // (workers * 8)),
+                    ),
+                    strict=True,
+                ):
+                    if self.cancelled:
+                        executor.shutdown(cancel_futures=True)
+                        break
+                    self._add_resources(path, resources, unique=unique)
+                    self._searched(path)
+        else:
+            for path in paths:
+                if self.cancelled:
+                    break
+                self.search_package(path, limit=limit, unique=unique)
+
+        if self.catalog is not None and not self.cancelled:
+            self.catalog.prune(folder, paths)
 
     def search_package(
         self,
@@ -224,34 +492,106 @@ class ResourceSearch:
         if isinstance(path, str):
             path = Path(path)
 
-        with path.open("rb") as file:
-            logger.debug("reading file: %s", path.name)
-            package: bytes = file.read()
+        with closing(self.find_resources(path, limit)) as resources:
+            self._add_resources(path, resources, unique=unique)
+        self._searched(path)
+
+    def find_resources(
+        self,
+        path: Path,
+        limit: float | None = None,
+    ) -> Generator[tuple[CompResource, Version]]:
+        """Find resources in package that satisfy search parameters, without adding them to the ResourceSearch.
+
+        Args:
+            path: Filepath of package to search in.
+            limit: Limit on how much of the contents of the resource to store.
 
-        if int.from_bytes(package[36:40], byteorder="little") == 0:
-            logger.warning("empty file: %s", path.name)
+        Yields:
+            Each resource found and the version of it to add.
+        """
+        if self.catalog is not None and self.target is None:
+            yield from self._find_catalog_resources(self.catalog, path, limit)
             return
 
-        header: ResourceHeader
-        for header in get_headers(package):
-            if header.rtype not in self._dict:
-                continue
-            if not self.validate_group(header.group):
+        candidates: set[int] | None = None
+        if self.index is not None and self.target:
+            candidates = self.index.candidates(path, list(self._types), self.target)
+            if candidates is not None and not candidates:
+                return
+
+        # only the index and the start of each resource (or a few resources) are needed
+        lazy: bool = limit in {0, LIMIT_FOR_CONFLICT} or candidates is not None
+
+        with Package(path, lazy=lazy) as package:
+            logger.debug("reading file: %s", path.name)
+
+            if int.from_bytes(package[36:40], byteorder="little") == 0:
+                logger.warning("empty file: %s", path.name)
+                return
+
+            header: ResourceHeader
+            for header in self.get_headers(package):
+                if candidates is not None and header.index not in candidates:
+                    continue
+
+                resource: CompResource = CompResource(package, header, limit)
+
+                if self.validate_resource(resource) is False:
+                    continue
+
+                yield resource, Version.of(path, header, resource)
+
+    def _find_catalog_resources(
+        self,
+        catalog: Catalog,
+        path: Path,
+        limit: float | None,
+    ) -> Generator[tuple[CompResource, Version]]:
+        entry: CatalogEntry
+        for entry in catalog.entries(path, list(self._types)):
+            if not self.validate_group(entry.group):
                 continue
-            if not self.validate_instance(header.instance):
+            if not self.validate_instance(entry.instance):
                 continue
 
-            resource: CompResource = CompResource(package, header, limit)
+            resource: CompResource = CompResource.from_entry(entry, limit)
 
             if self.validate_resource(resource) is False:
                 continue
 
+            yield (
+                resource,
+                Version(path, entry.offset, entry.length, entry.compressed),
+            )
+
+    def _add_resources(
+        self,
+        path: Path,
+        resources: Iterable[tuple[CompResource, Version]],
+        *,
+        unique: bool,
+    ) -> None:
+        resource: CompResource
+        version: Version
+        for resource, version in resources:
             if (
-                self.append(resource, path.name, resource.contents, unique=unique)
-                is False
+                self.cancelled
+                or self.append(resource, path.name, version, unique=unique) is False
             ):
                 break
 
+    def _copy_filters(self) -> Self:
+        return type(self)(
+            list(self._types),
+            filter_group=self.filter_group,
+            filter_instance=self.filter_instance,
+            filter_name=self.filter_name,
+            target=self.target,
+            catalog=self.catalog,
+            index=self.index,
+        )
+
     @staticmethod
     def validate_strs(resource: CompResource) -> bool:
         """Check if strings have translations, empty strings, descriptions, or can otherwise be cleaned by SimPE.
@@ -286,36 +626,35 @@ class ResourceSearch:
         if isinstance(path, str):
             path = Path(path)
 
-        with path.open("rb") as file:
+        with Package(path) as package:
             logger.debug("reading file: %s", path.name)
-            package: bytes = file.read()
 
-        if int.from_bytes(package[36:40], byteorder="little") == 0:
-            logger.warning("empty file: %s", path.name)
-            return
+            header: ResourceHeader
+            if int.from_bytes(package[36:40], byteorder="little") == 0:
+                logger.warning("empty file: %s", path.name)
+            else:
+                for header in self.get_headers(package):
+                    if self.cancelled:
+                        break
 
-        header: ResourceHeader
-        for header in get_headers(package):
-            if header.rtype not in self._dict:
-                continue
-            if not self.validate_group(header.group):
-                continue
-            if not self.validate_instance(header.instance):
-                continue
-
-            resource: CompResource = CompResource(package, header, limit)
+                    resource: CompResource = CompResource(package, header, limit)
 
-            if self.validate_resource(resource) is False:
-                continue
+                    if self.validate_resource(resource) is False:
+                        continue
 
-            if self.validate_strs(resource):
-                _ = self.append(resource, path.name, resource.contents)
+                    if self.validate_strs(resource):
+                        _ = self.append(
+                            resource,
+                            path.name,
+                            Version.of(path, header, resource),
+                        )
+        self._searched(path)
 
     def append(
         self,
         v: CompResource,
         filename: str,
-        resource: bytes,
+        version: Version,
         *,
         unique: bool = True,
     ) -> bool:
@@ -324,43 +663,79 @@ class ResourceSearch:
         Args:
             v: Resource to add.
             filename: Filename of package that the resource was found in.
-            resource: Contents of the resource.
+            version: Location of the resource in that file.
             unique: Allow adding new resources not already in the ResourceSearch (versus just new versions of existing resources).
 
         Returns:
             True if Resource's type is valid for this ResourceSearch, false otherwise.
         """
-        if v.rtype not in self._dict:
+        rtype: int | None = self._types.get(v.rtype)
+        if rtype is None:
             return False
 
-        if v.group not in self._dict[v.rtype]:
-            self._dict[v.rtype][v.group] = {}
-        if v.classid not in self._dict[v.rtype][v.group]:
-            self._dict[v.rtype][v.group][v.classid] = {}
-        if v.instance in self._dict[v.rtype][v.group][v.classid]:
-            if filename in self._dict[v.rtype][v.group][v.classid][v.instance].files:
+        key: int = self._key(rtype, v.group, v.classid, v.instance)
+        existing: CompResource | None = self._resources.get(key)
+        if existing is not None:
+            if filename in existing.files:
                 return False
-            self._dict[v.rtype][v.group][v.classid][v.instance].add_version(
-                filename,
-                resource,
-            )
+            existing.add_version(filename, version)
+            self._found.append(existing)
         elif unique:
-            v.add_version(filename, resource)
-            self._dict[v.rtype][v.group][v.classid][v.instance] = v
+            v.add_version(filename, version)
+            self._resources[key] = v
+            self._order = None
+            self._found.append(v)
         return True
 
+    def found(self, start: int = 0) -> list[CompResource]:
+        """Get resources in the order they were found, which is safe while the search is running in another thread.
+
+        A resource is listed again each time it is found in another file.
+
+        Args:
+            start: Number of resources to skip, such as the number returned by earlier calls.
+
+        Returns:
+            Resources found after the first start resources.
+        """
+        return self._found[start:]
+
     def get_items(self) -> list[CompResource]:
         """Get list of all resources stored in the ResourceSearch.
 
         Returns:
             List of all resources.
         """
-        items: list[CompResource] = []
-        for rtype in self._dict.values():
-            for group in rtype.values():
-                for classid in group.values():
-                    items += list(classid.values())
-        return items
+        return list(self.iter_items())
+
+    def iter_items(self) -> Iterator[CompResource]:
+        """Iterate over all resources stored in the ResourceSearch.
+
+        Resources are grouped by type in the order of the type filter, then by group and class ID in the order they were first found.
+
+        Returns:
+            Iterator over each resource.
+        """
+        if self._order is None:
+            # rank each group and class ID by when it was first found
+            groups: dict[int, int] = {}
+            classids: dict[int, int] = {}
+            key: int
+            for key in self._resources:
+                _ = groups.setdefault(key >> 64, len(groups))
+                _ = classids.setdefault(key >> 32, len(classids))
+            self._order = [
+                self._resources[i]
+                for i in sorted(
+                    self._resources,
+                    key=lambda i: (i >> 96, groups[i >> 64], classids[i >> 32]),
+                )
+            ]
+        return iter(self._order)
+
+    @staticmethod
+    def _key(rtype: int, group: bytes, classid: bytes, instance: bytes) -> int:
+        return rtype << 96 | int.from_bytes(group + classid + instance)
 
     def print_resources(
         self,
@@ -376,25 +751,64 @@ class ResourceSearch:
         Returns:
             String describing all of the resources in the ResourceSearch.
         """
-        chars: str = ""
+        return "".join(
+            self.iter_resources(
+                min_files=min_files,
+                max_files=max_files,
+                min_versions=min_versions,
+                max_versions=max_versions,
+                printfiles=printfiles,
+            ),
+        )
+
+    def iter_resources(
+        self,
+        *,
+        min_files: int = 1,
+        max_files: float | None = None,
+        min_versions: int = 1,
+        max_versions: float | None = None,
+        printfiles: bool = True,
+    ) -> Generator[str]:
+        """Get information about the resources in the ResourceSearch one resource at a time.
+
+        The records are only formatted as they are consumed, so results can be shown before all of them have been formatted.
+
+        Yields:
+            String describing each resource, followed by a count of the results.
+        """
         count: int = 0
         resource: CompResource
-        for resource in self.get_items():
+        for resource in self.iter_items():
             if len(resource.files) < min_files or (
                 max_files and len(set(resource.files)) > max_files
             ):
                 continue
-            if len(set(resource.versions)) < min_versions or (
-                max_versions and len(set(resource.versions)) > max_versions
+            if (min_versions > 1 or max_versions) and not self._versions_match(
+                resource,
+                min_versions,
+                max_versions,
             ):
                 continue
-            chars += resource.print()
+            chars: str = resource.print()
             if printfiles:
                 chars += resource.print_files()
-            chars += "\n"
+            yield f"{chars}\n"
             count += 1
-        chars += f"{count} results found."
-        return chars
+        yield f"{count} results found."
+
+    @staticmethod
+    def _versions_match(
+        resource: CompResource,
+        min_versions: int,
+        max_versions: float | None,
+    ) -> bool:
+        if len(resource.versions) < min_versions:
+            return False
+        digests: set[bytes] = {i.digest() for i in resource.versions}
+        return len(digests) >= min_versions and not (
+            max_versions and len(digests) > max_versions
+        )
 
     def print_resource(
         self,
@@ -414,6 +828,36 @@ class ResourceSearch:
         Returns:
             String describing the given resource.
         """
-        chars: str = self._dict[rtype][group][classid][instance].print_versions()
-        chars += "\nSearch complete."
-        return chars
+        return "".join(self.iter_resource(rtype, group, classid, instance))
+
+    def iter_resource(
+        self,
+        rtype: bytes,
+        group: bytes,
+        classid: bytes,
+        instance: bytes,
+    ) -> Generator[str]:
+        """Get information about the given resource line by line.
+
+        Args:
+            rtype: Type of resource to print.
+            group: Group containing the resource to print.
+            instance: Instance of the resource to print.
+            classid: Class ID (aka instance (high)) of the resource to print.
+
+        Yields:
+            Each line describing the given resource.
+        """
+        resource: CompResource = self._resources[
+            self._key(self._types[rtype], group, classid, instance)
+        ]
+        yield from resource.iter_versions()
+        yield "\nSearch complete."
+
+
+def _find_resources(
+    search: ResourceSearch,
+    path: Path,
+    limit: float | None,
+) -> list[tuple[CompResource, Version]]:
+    return list(search.find_resources(path, limit))
@@ -1,18 +1,257 @@
 """A program for viewing information about your neighborhoods in a tabulated spreadsheet."""
 
+import queue
 import tkinter as tk
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import suppress
+from functools import partial
 from logging import Logger, getLogger
 from pathlib import Path
 from tkinter import ttk
+from typing import Any
 
-from sims2.common.logging import config_logging, handle_exception
+from sims2.common.logging import config_logging, get_state_path, handle_exception
 from sims2.simtracker._config import config_traits, folders_nhoods
-from sims2.simtracker.search import families, search_nhood, sims
+from sims2.simtracker.index import IndexedSim, SimIndex
+from sims2.simtracker.search import search_nhood, search_nhoods
 from sims2.simtracker.sim import Family, Sim, SupernaturalFlags, TurnOns1
-from sims2.simtracker.widgets import ImageButton, SimsTree, SortTree
+from sims2.simtracker.snapshot import NeighborhoodSnapshot
+from sims2.simtracker.thumbnails import ThumbnailCache
+from sims2.simtracker.widgets import ImageButton, LazyTree, Row, SimsTree, SortTree
 
 logger: Logger = getLogger(__name__)
 
+# milliseconds between checks for neighborhood thumbnails that are ready
+THUMBNAIL_INTERVAL: int = 50
+# milliseconds between checks for neighborhoods that Scan All has searched
+SCAN_INTERVAL: int = 100
+
+# names of NPCs left out of the sim tabs
+_HIDDEN_SIMS: set[str] = {
+    "Unknown",
+    "Social Bunny",
+    "Social Worker",
+    "Repo Man",
+    "Unsavory Charlatan",
+    "Tour Guide",
+    "Local Chef",
+    "Fire Dancer",
+    "Pirate Captain Edward Dregg",
+    "Ninja",
+    "Food Judge",
+    "Break Dancer",
+    "Human Statue",
+    "Hot Dog Chef",
+}
+
+
+def _sim_rows(
+    snapshot: NeighborhoodSnapshot,
+    nids: list[bytes],
+    values: Callable[[Sim], list[Any]],  # pyright: ignore[reportExplicitAny]
+) -> Iterator[Row]:
+    # iids are the same in every tab so SimsTree widgets can be sorted together
+    i: int
+    nid: bytes
+    for i, nid in enumerate(nids):
+        sim: Sim = snapshot.sims[nid]
+        yield f"{i:06d}", f"{sim.name[0]} {sim.name[1]}", values(sim)
+
+
+def _sims_rows(snapshot: NeighborhoodSnapshot, nids: list[bytes]) -> Iterator[Row]:
+    i: int
+    nid: bytes
+    for i, nid in enumerate(nids):
+        sim: Sim = snapshot.sims[nid]
+        yield (
+            f"{i:06d}",
+            f"{sim.name[0]} {sim.name[1]} ({int.from_bytes(nid, byteorder='little')})",
+            [
+                snapshot.families[sim.fam].name,
+                sim.age,
+                sim.death if sim.death != 0 else "",
+                sim.personality.neat,
+                sim.personality.outgoing,
+                sim.personality.active,
+                sim.personality.playful,
+                sim.personality.nice,
+                sim.asp[0],
+                sim.asp[1],
+                sim.ltw,
+                sim.lta,
+                sim.lta_benefits,
+            ],
+        )
+
+
+def _pet_values(snapshot: NeighborhoodSnapshot, sim: Sim) -> list[Any]:  # pyright: ignore[reportExplicitAny]
+    return [snapshot.families[sim.fam].name, sim.age]
+
+
+def _traits(sim: Sim) -> list[Any]:  # pyright: ignore[reportExplicitAny]
+    return [
+        sim.traits[0],
+        sim.traits[1],
+        sim.traits[2],
+        sim.traits[3],
+        sim.traits[4],
+    ]
+
+
+def _interests(sim: Sim) -> list[Any]:  # pyright: ignore[reportExplicitAny]
+    return [
+        sim.interests.environment,
+        sim.interests.food,
+        sim.interests.weather,
+        sim.interests.culture,
+        sim.interests.money,
+        sim.interests.politics,
+        sim.interests.paranormal,
+        sim.interests.health,
+        sim.interests.fashion,
+        sim.interests.travel,
+        sim.interests.crime,
+        sim.interests.sports,
+        sim.interests.entertainment,
+        sim.interests.animals,
+        sim.interests.work,
+        sim.interests.school,
+        sim.interests.toys,
+        sim.interests.scifi,
+    ]
+
+
+def _hobbies(sim: Sim) -> list[Any]:  # pyright: ignore[reportExplicitAny]
+    return [
+        sim.oth,
+        sim.hobbies.cuisine,
+        sim.hobbies.art,
+        sim.hobbies.lit,
+        sim.hobbies.sports,
+        sim.hobbies.games,
+        sim.hobbies.nature,
+        sim.hobbies.tinkering,
+        sim.hobbies.fitness,
+        sim.hobbies.science,
+        sim.hobbies.music,
+    ]
+
+
+def _jobs(sim: Sim) -> list[Any]:  # pyright: ignore[reportExplicitAny]
+    return [
+        sim.skills.cooking,
+        sim.skills.mechanical,
+        sim.skills.charisma,
+        sim.skills.body,
+        sim.skills.logic,
+        sim.skills.creativity,
+        sim.skills.cleaning,
+        sim.major,
+        sim.job.career,
+        sim.job.title,
+        sim.job.level if sim.job.level != 0 else "",
+    ]
+
+
+def _chemistry(sim: Sim) -> list[Any]:  # pyright: ignore[reportExplicitAny]
+    return [
+        sim.sexuality,
+        "True" if sim.has_turnon_trait(TurnOns1.FAT, 0) else "",
+        "True" if sim.has_turnon_trait(TurnOns1.FIT, 0) else "",
+        "True" if sim.has_turnon_trait(TurnOns1.BEARD, 0) else "",
+        "True" if sim.has_turnon_trait(TurnOns1.GLASSES, 0) else "",
+        "True" if sim.has_turnon_trait(TurnOns1.MAKEUP, 0) else "",
+        "True" if sim.has_turnon_trait(TurnOns1.FULLFACE, 0) else "",
+        "True" if sim.has_turnon_trait(TurnOns1.HATS, 0) else "",
+        "True" if sim.has_turnon_trait(TurnOns1.JEWELRY, 0) else "",
+        sim.tos[0],
+        sim.tos[1],
+        sim.tos[-1],
+    ]
+
+
+def _genetics(sim: Sim) -> list[Any]:  # pyright: ignore[reportExplicitAny]
+    return [
+        sim.genes.skin.dominant,
+        sim.genes.skin.recessive,
+        sim.genes.skin.range1,
+        sim.genes.skin.range2,
+        sim.genes.hair.dominant,
+        sim.genes.hair.recessive,
+        sim.genes.eyes.dominant,
+        sim.genes.eyes.recessive,
+    ]
+
+
+def _supernatural(sim: Sim) -> list[Any]:  # pyright: ignore[reportExplicitAny]
+    return [
+        "True" if sim.is_supernatural(SupernaturalFlags.GHOST) else "",
+        "True" if sim.is_supernatural(SupernaturalFlags.ZOMBIE) else "",
+        "True" if sim.is_supernatural(SupernaturalFlags.VAMPIRE) else "",
+        "True" if sim.is_supernatural(SupernaturalFlags.SERVO) else "",
+        "True" if sim.is_supernatural(SupernaturalFlags.WEREWOLF) else "",
+        "True" if sim.is_supernatural(SupernaturalFlags.PLANTSIM) else "",
+        "True" if sim.is_supernatural(SupernaturalFlags.GENIE) else "",
+        "True" if sim.is_supernatural(SupernaturalFlags.WITCH) else "",
+        "True" if sim.is_supernatural(SupernaturalFlags.MERMAID) else "",
+        "True" if sim.is_supernatural(SupernaturalFlags.FAIRY) else "",
+    ]
+
+
+# values of each sim in each tab with a row for every sim
+_SIM_VALUES: dict[str, Callable[[Sim], list[Any]]] = {  # pyright: ignore[reportExplicitAny]
+    "Traits": _traits,
+    "Interests": _interests,
+    "Hobbies": _hobbies,
+    "Jobs": _jobs,
+    "Chemistry": _chemistry,
+    "Genetics": _genetics,
+    "Supernatural": _supernatural,
+}
+
+
+def _family_rows(snapshot: NeighborhoodSnapshot) -> Iterator[Row]:
+    min_special_fam: int = 32000
+    n: int = 0
+    i: bytes
+    family: Family
+    for i, family in snapshot.families.items():
+        if i == b"\x00\x00" or int.from_bytes(i, byteorder="little") >= min_special_fam:
+            continue
+        n += 1
+        yield (
+            f"{n:06d}",
+            f"{family.name}",
+            [
+                family.day,
+                family.time,
+                family.season,
+                family.ssnlngth,
+            ],
+        )
+
+
+def _index_rows(sims: list[IndexedSim]) -> Iterator[Row]:
+    i: int
+    sim: IndexedSim
+    for i, sim in enumerate(sims):
+        yield (
+            f"{i:06d}",
+            sim.name,
+            [
+                sim.nhood,
+                sim.family,
+                sim.career,
+                sim.title,
+                ", ".join(
+                    str(flag.name).title()
+                    for flag in SupernaturalFlags
+                    if sim.spnflags & flag
+                ),
+            ],
+        )
+
 
 # pylint: disable=too-many-ancestors
 class MainApp(ttk.Notebook):
@@ -29,9 +268,24 @@ class MainApp(ttk.Notebook):
 
         super().__init__(master)
 
+        self.snapshot: NeighborhoodSnapshot | None = None
+        self.sim_index: SimIndex = SimIndex()
+        self.nhoods: list[tuple[str, Path]] = []
+        self.thumbnails: ThumbnailCache = ThumbnailCache(
+            get_state_path("simtracker") / "thumbnails",
+            300,
+            225,
+        )
+        self.placeholder: tk.PhotoImage = tk.PhotoImage(width=300, height=225)
+
+        # Scan All runs in a worker thread so the window stays responsive
+        self._worker: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=1)
+
         self._add_nhood_frame()
 
-        self.trees: dict[str, ttk.Treeview] = {}
+        self.trees: dict[str, LazyTree] = {}
+        self.tab_trees: dict[str, LazyTree] = {}
+        _ = self.bind("<<NotebookTabChanged>>", lambda _: self._show_tab())
 
         self._add_sims_tree(
             "Sims",
@@ -175,7 +429,7 @@ class MainApp(ttk.Notebook):
         tab: tk.Frame = tk.Frame(self)
         self.add(tab, text="Bio")
         ttk.Style().configure("Bio.Treeview", rowheight=50)  # pyright: ignore[reportUnknownMemberType]
-        tree: ttk.Treeview = ttk.Treeview(
+        tree: LazyTree = LazyTree(
             tab,
             style="Bio.Treeview",
             columns=["Bio"],
@@ -185,6 +439,7 @@ class MainApp(ttk.Notebook):
         tree.heading("Bio", text="Bio")
         tree.pack(expand=True, fill=tk.BOTH)
         self.trees["Bios"] = tree
+        self.tab_trees[str(tab)] = tree
 
         self._add_sort_tree("Pets", ["Family", "Age"], [100, 50])
 
@@ -194,11 +449,12 @@ class MainApp(ttk.Notebook):
             [50, 50, 50, 50],
         )
 
+        self._add_index_frame()
+
         self.pack(expand=True, fill=tk.BOTH)
 
     def _add_nhood_frame(self) -> None:
         nhoods: tk.Frame = tk.Frame(self)
-        folders: list[tuple[str, Path]] = []
         nhoods_folder: Path
         for nhoods_folder in folders_nhoods:
             if not nhoods_folder.exists():
@@ -210,25 +466,78 @@ class MainApp(ttk.Notebook):
                 if nhood.name == "Tutorial":
                     continue
                 if nhood.is_dir():
-                    folders.append((nhood.name, nhoods_folder))
-
-        if len(folders) > 0:
+                    self.nhoods.append((nhood.name, nhoods_folder))
+
+        if len(self.nhoods) > 0:
+            # thumbnails are found in the background and replace placeholders when ready
+            executor: ThreadPoolExecutor = ThreadPoolExecutor()
+            pending: list[
+                tuple[ImageButton, Path, Future[tuple[Path, str | None]]]
+            ] = []
             i: int
             n: tuple[str, Path]
-            for i, n in enumerate(folders):
+            for i, n in enumerate(self.nhoods):
                 button: ImageButton = ImageButton(
                     nhoods,
-                    imgfile=f"{n[1]}/{n[0]}/{n[0]}_Neighborhood.png",
-                    imgwidth=300,
-                    imgheight=225,
+                    image=self.placeholder,
                     text=n[0],
                     compound="top",
                     command=lambda x=n[0], y=n[1]: self.search(x, y),
                 )
                 button.grid(row=i // 3, column=i % 3)
+                image: Path = n[1] / n[0] / f"{n[0]}_Neighborhood.png"
+                pending.append(
+                    (button, image, executor.submit(self.thumbnails.load, image)),
+                )
+            executor.shutdown(wait=False)
+            _ = self.after(THUMBNAIL_INTERVAL, self._show_thumbnails, pending)
+
+            self.button_scan: ttk.Button = ttk.Button(
+                nhoods,
+                text="Scan All",
+                command=self.scan_all,
+            )
+            self.button_scan.grid(
+                row=(len(self.nhoods) + 2) // 3,
+                column=0,
+                columnspan=3,
+            )
 
         self.add(nhoods, text="Neighborhoods")
 
+    def _show_thumbnails(
+        self,
+        pending: list[tuple[ImageButton, Path, Future[tuple[Path, str | None]]]],
+    ) -> None:
+        waiting: list[tuple[ImageButton, Path, Future[tuple[Path, str | None]]]] = []
+        made: bool = False
+        button: ImageButton
+        image: Path
+        future: Future[tuple[Path, str | None]]
+        for button, image, future in pending:
+            if not future.done():
+                waiting.append((button, image, future))
+                continue
+            try:
+                path: Path
+                data: str | None
+                path, data = future.result()
+                if data is not None:
+                    button.set_image(tk.PhotoImage(data=data))
+                elif not made:
+                    # thumbnails are made one at a time so the window keeps responding
+                    button.set_image(self.thumbnails.make(image, path))
+                    made = True
+                else:
+                    waiting.append((button, image, future))
+            except (OSError, tk.TclError):
+                logger.warning("could not load neighborhood image: %s", image)
+
+        if made:
+            _ = self.after_idle(self._show_thumbnails, waiting)
+        elif waiting:
+            _ = self.after(THUMBNAIL_INTERVAL, self._show_thumbnails, waiting)
+
     def _add_sort_tree(self, text: str, columns: list[str], widths: list[int]) -> None:
         tab: tk.Frame = tk.Frame(self)
         self.add(tab, text=text)
@@ -237,6 +546,7 @@ class MainApp(ttk.Notebook):
         tree.pack()
 
         self.trees[text] = tree
+        self.tab_trees[str(tab)] = tree
 
     def _add_sims_tree(self, text: str, columns: list[str], widths: list[int]) -> None:
         tab: tk.Frame = tk.Frame(self)
@@ -246,230 +556,166 @@ class MainApp(ttk.Notebook):
         tree.pack()
 
         self.trees[text] = tree
+        self.tab_trees[str(tab)] = tree
+
+    def _add_index_frame(self) -> None:
+        tab: tk.Frame = tk.Frame(self)
+        self.add(tab, text="All Sims")
+
+        bar: tk.Frame = tk.Frame(tab)
+        bar.pack(fill=tk.X)
+        self.index_field: ttk.Combobox = ttk.Combobox(
+            bar,
+            values=["Name", "Career", "Family", "Lifestate"],
+            state="readonly",
+            width=10,
+        )
+        self.index_field.set("Name")
+        self.index_field.pack(side=tk.LEFT)
+        self.index_query: ttk.Entry = ttk.Entry(bar)
+        self.index_query.pack(side=tk.LEFT, expand=True, fill=tk.X)
+        _ = self.index_query.bind("<Return>", lambda _: self.find())
+        find: ttk.Button = ttk.Button(bar, text="Find", command=self.find)
+        find.pack(side=tk.LEFT)
+
+        frame: tk.Frame = tk.Frame(tab)
+        frame.pack(expand=True, fill=tk.BOTH)
+        self.index_tree: SortTree = SortTree(
+            frame,
+            ["Neighborhood", "Family", "Career", "Job", "Lifestates"],
+            [100, 100, 100, 150, 200],
+        )
+        self.index_tree.pack()
+        self.tab_trees[str(tab)] = self.index_tree
 
     def search(self, nhood: str, nhoods_folder: Path) -> None:
         """Search neighborhood for information about sims and families.
 
+        Tabs are only filled once they are shown.
+
         Args:
             nhood: Identifier of neighborhood.
             nhoods_folder: Folder containing neighborhood.
         """
-        tree: ttk.Treeview
-        for tree in self.trees.values():
-            tree.delete(*tree.get_children())
-
-        search_nhood(nhood, nhoods_folder)
-
-        i: bytes
-        sim: Sim
-        for i, sim in sims.items():
-            if sim.species != b"\x00\x00":
-                _ = self.trees["Pets"].insert(
-                    "",
-                    tk.END,
-                    text=f"{sim.name[0]} {sim.name[1]}",
-                    values=[families[sim.fam].name, sim.age],
-                )
-            else:
-                if sim.name[0] in {
-                    "Unknown",
-                    "Social Bunny",
-                    "Social Worker",
-                    "Repo Man",
-                    "Unsavory Charlatan",
-                    "Tour Guide",
-                    "Local Chef",
-                    "Fire Dancer",
-                    "Pirate Captain Edward Dregg",
-                    "Ninja",
-                    "Food Judge",
-                    "Break Dancer",
-                    "Human Statue",
-                    "Hot Dog Chef",
-                }:
-                    continue
-                _ = self.trees["Sims"].insert(
-                    "",
-                    tk.END,
-                    text=f"{sim.name[0]} {sim.name[1]} ({int.from_bytes(i, byteorder='little')})",
-                    values=[
-                        families[sim.fam].name,
-                        sim.age,
-                        sim.death if sim.death != 0 else "",
-                        sim.personality.neat,
-                        sim.personality.outgoing,
-                        sim.personality.active,
-                        sim.personality.playful,
-                        sim.personality.nice,
-                        sim.asp[0],
-                        sim.asp[1],
-                        sim.ltw,
-                        sim.lta,
-                        sim.lta_benefits,
-                    ],
-                )
-                if config_traits:
-                    _ = self.trees["Traits"].insert(
-                        "",
-                        tk.END,
-                        text=f"{sim.name[0]} {sim.name[1]}",
-                        values=[
-                            sim.traits[0],
-                            sim.traits[1],
-                            sim.traits[2],
-                            sim.traits[3],
-                            sim.traits[4],
-                        ],
-                    )
-                _ = self.trees["Interests"].insert(
-                    "",
-                    tk.END,
-                    text=f"{sim.name[0]} {sim.name[1]}",
-                    values=[
-                        sim.interests.environment,
-                        sim.interests.food,
-                        sim.interests.weather,
-                        sim.interests.culture,
-                        sim.interests.money,
-                        sim.interests.politics,
-                        sim.interests.paranormal,
-                        sim.interests.health,
-                        sim.interests.fashion,
-                        sim.interests.travel,
-                        sim.interests.crime,
-                        sim.interests.sports,
-                        sim.interests.entertainment,
-                        sim.interests.animals,
-                        sim.interests.work,
-                        sim.interests.school,
-                        sim.interests.toys,
-                        sim.interests.scifi,
-                    ],
-                )
-                _ = self.trees["Hobbies"].insert(
-                    "",
-                    tk.END,
-                    text=f"{sim.name[0]} {sim.name[1]}",
-                    values=[
-                        sim.oth,
-                        sim.hobbies.cuisine,
-                        sim.hobbies.art,
-                        sim.hobbies.lit,
-                        sim.hobbies.sports,
-                        sim.hobbies.games,
-                        sim.hobbies.nature,
-                        sim.hobbies.tinkering,
-                        sim.hobbies.fitness,
-                        sim.hobbies.science,
-                        sim.hobbies.music,
-                    ],
-                )
-                _ = self.trees["Jobs"].insert(
-                    "",
-                    tk.END,
-                    text=f"{sim.name[0]} {sim.name[1]}",
-                    values=[
-                        sim.skills.cooking,
-                        sim.skills.mechanical,
-                        sim.skills.charisma,
-                        sim.skills.body,
-                        sim.skills.logic,
-                        sim.skills.creativity,
-                        sim.skills.cleaning,
-                        sim.major,
-                        sim.job.career,
-                        sim.job.title,
-                        sim.job.level if sim.job.level != 0 else "",
-                    ],
-                )
-                _ = self.trees["Chemistry"].insert(
-                    "",
-                    tk.END,
-                    text=f"{sim.name[0]} {sim.name[1]}",
-                    values=[
-                        sim.sexuality,
-                        "True" if sim.has_turnon_trait(TurnOns1.FAT, 0) else "",
-                        "True" if sim.has_turnon_trait(TurnOns1.FIT, 0) else "",
-                        "True" if sim.has_turnon_trait(TurnOns1.BEARD, 0) else "",
-                        "True" if sim.has_turnon_trait(TurnOns1.GLASSES, 0) else "",
-                        "True" if sim.has_turnon_trait(TurnOns1.MAKEUP, 0) else "",
-                        "True" if sim.has_turnon_trait(TurnOns1.FULLFACE, 0) else "",
-                        "True" if sim.has_turnon_trait(TurnOns1.HATS, 0) else "",
-                        "True" if sim.has_turnon_trait(TurnOns1.JEWELRY, 0) else "",
-                        sim.tos[0],
-                        sim.tos[1],
-                        sim.tos[-1],
-                    ],
-                )
-                _ = self.trees["Genetics"].insert(
-                    "",
-                    tk.END,
-                    text=f"{sim.name[0]} {sim.name[1]}",
-                    values=[
-                        sim.genes.skin.dominant,
-                        sim.genes.skin.recessive,
-                        sim.genes.skin.range1,
-                        sim.genes.skin.range2,
-                        sim.genes.hair.dominant,
-                        sim.genes.hair.recessive,
-                        sim.genes.eyes.dominant,
-                        sim.genes.eyes.recessive,
-                    ],
-                )
-                _ = self.trees["Supernatural"].insert(
-                    "",
-                    tk.END,
-                    text=f"{sim.name[0]} {sim.name[1]}",
-                    values=[
-                        "True" if sim.is_supernatural(SupernaturalFlags.GHOST) else "",
-                        "True" if sim.is_supernatural(SupernaturalFlags.ZOMBIE) else "",
-                        "True"
-                        if sim.is_supernatural(SupernaturalFlags.VAMPIRE)
-                        else "",
-                        "True" if sim.is_supernatural(SupernaturalFlags.SERVO) else "",
-                        "True"
-                        if sim.is_supernatural(SupernaturalFlags.WEREWOLF)
-                        else "",
-                        "True"
-                        if sim.is_supernatural(SupernaturalFlags.PLANTSIM)
-                        else "",
-                        "True" if sim.is_supernatural(SupernaturalFlags.GENIE) else "",
-                        "True" if sim.is_supernatural(SupernaturalFlags.WITCH) else "",
-                        "True"
-                        if sim.is_supernatural(SupernaturalFlags.MERMAID)
-                        else "",
-                        "True" if sim.is_supernatural(SupernaturalFlags.FAIRY) else "",
-                    ],
-                )
-                if sim.bio:
-                    _ = self.trees["Bios"].insert(
-                        "",
-                        tk.END,
-                        text=f"{sim.name[0]} {sim.name[1]}",
-                        values=[sim.bio],
-                    )
-
-        family: Family
-        for i, family in families.items():
-            min_special_fam: int = 32000
-            if (
-                i == b"\x00\x00"
-                or int.from_bytes(i, byteorder="little") >= min_special_fam
-            ):
-                continue
-            _ = self.trees["Families"].insert(
-                "",
-                tk.END,
-                text=f"{family.name}",
-                values=[
-                    family.day,
-                    family.time,
-                    family.season,
-                    family.ssnlngth,
-                ],
-            )
+        snapshot: NeighborhoodSnapshot = search_nhood(nhood, nhoods_folder)
+        self.snapshot = snapshot
+
+        pets: list[bytes] = snapshot.sims.select(
+            snapshot.sims.equals("species", 0),
+            invert=True,
+        )
+        sims: list[bytes] = [
+            i
+            for i in snapshot.sims.select(snapshot.sims.equals("species", 0))
+            if snapshot.sims[i].name[0] not in _HIDDEN_SIMS
+        ]
+
+        self.trees["Pets"].defer(
+            partial(_sim_rows, snapshot, pets, partial(_pet_values, snapshot)),
+        )
+        self.trees["Sims"].defer(partial(_sims_rows, snapshot, sims))
+        name: str
+        values: Callable[[Sim], list[Any]]  # pyright: ignore[reportExplicitAny]
+        for name, values in _SIM_VALUES.items():
+            if name in self.trees:
+                self.trees[name].defer(partial(_sim_rows, snapshot, sims, values))
+        self.trees["Bios"].defer(
+            partial(
+                _sim_rows,
+                snapshot,
+                [i for i in sims if snapshot.sims[i].bio],
+                lambda sim: [sim.bio],
+            ),
+        )
+        self.trees["Families"].defer(partial(_family_rows, snapshot))
 
         self.select(self.tabs()[1])  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+        self._show_tab()
+
+    def _show_tab(self) -> None:
+        tree: LazyTree | None = self.tab_trees.get(str(self.select()))  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+        if tree is not None:
+            tree.show()
+
+    def scan_all(self) -> None:
+        """Search every neighborhood at once and add their sims to the index of all sims.
+
+        Neighborhoods are searched from a worker thread, and each one is added to the index as soon as it has been searched.
+        """
+        self.sim_index.clear()
+        self.find()
+        self.button_scan["state"] = tk.DISABLED
+        self.select(self.tabs()[-1])  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+
+        snapshots: queue.Queue[NeighborhoodSnapshot] = queue.Queue()
+        future: Future[None] = self._worker.submit(
+            self._scan_nhoods,
+            list(self.nhoods),
+            snapshots,
+        )
+        _ = self.after(SCAN_INTERVAL, self._poll_scan, future, snapshots)
+
+    @staticmethod
+    def _scan_nhoods(
+        nhoods: list[tuple[str, Path]],
+        snapshots: queue.Queue[NeighborhoodSnapshot],
+    ) -> None:
+        snapshot: NeighborhoodSnapshot
+        for snapshot in search_nhoods(nhoods):
+            snapshots.put(snapshot)
+
+    def _poll_scan(
+        self,
+        future: Future[None],
+        snapshots: queue.Queue[NeighborhoodSnapshot],
+    ) -> None:
+        # checked before emptying the queue so no snapshot is left in it once done
+        done: bool = future.done()
+        added: bool = False
+        with suppress(queue.Empty):
+            while True:
+                self.sim_index.add(snapshots.get_nowait())
+                added = True
+        if added:
+            self.find()
+
+        if not done:
+            _ = self.after(SCAN_INTERVAL, self._poll_scan, future, snapshots)
+            return
+
+        self.button_scan["state"] = tk.NORMAL
+        _ = future.result()
+        logger.info(
+            "indexed %d sims in %d neighborhoods",
+            len(self.sim_index),
+            len(self.nhoods),
+        )
+
+    def find(self) -> None:
+        """Show the sims in the index of all sims that match the search."""
+        field: str = self.index_field.get().lower()
+        query: str = self.index_query.get().strip()
+        sims: list[IndexedSim]
+        if field == "lifestate":
+            lifestate: SupernaturalFlags | None = (
+                SupernaturalFlags.__members__.get(query.upper())
+                if query
+                else SupernaturalFlags(0)
+            )
+            sims = (
+                self.sim_index.search(lifestate=lifestate)
+                if lifestate is not None
+                else []
+            )
+        elif field == "career":
+            sims = self.sim_index.search(career=query)
+        elif field == "family":
+            sims = self.sim_index.search(family=query)
+        else:
+            sims = self.sim_index.search(name=query)
+
+        self.index_tree.defer(partial(_index_rows, sims))
+        self.index_tree.show()
 
 
 def main() -> None:
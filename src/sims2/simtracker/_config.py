@@ -23,6 +23,64 @@ config: ConfigParser = load(
     },
     default_file=Path(__file__).parent / "config.ini",
 )
+# files config values are read from, default values first
+config_paths: tuple[Path, ...] = (Path(__file__).parent / "config.ini", _path)
 
 folders_nhoods: list[Path] = [Path(x) for x in config["paths"].values()]
 config_traits: bool = config.getboolean("config", "traits")
+config_midge: bool = config.getboolean("config", "midge", fallback=False)
+
+
+def _compile_hex(section: str) -> dict[bytes, str]:
+    # options are written as the str() of hexlified bytes, e.g. b'cc00'
+    compiled: dict[bytes, str] = {}
+    if not config.has_section(section):
+        return compiled
+    key: str
+    value: str
+    for key, value in config.items(section):
+        if key[:2] == "b'" and key[-1:] == "'":
+            try:
+                compiled[bytes.fromhex(key[2:-1])] = value
+            except ValueError:
+                continue
+    return compiled
+
+
+def _compile_int(section: str) -> dict[int, str]:
+    compiled: dict[int, str] = {}
+    if not config.has_section(section):
+        return compiled
+    key: str
+    value: str
+    for key, value in config.items(section):
+        try:
+            compiled[int(key)] = value
+        except ValueError:
+            continue
+    return compiled
+
+
+# config sections compiled into dicts keyed by the raw values read from resources
+config_careers: dict[bytes, dict[str, str]] = {
+    bytes.fromhex(i.removeprefix("careers.")[2:-1]): dict(config.items(i))
+    for i in config.sections()
+    if i.startswith("careers.b'")
+}
+config_npcs: dict[bytes, str] = _compile_hex("npcs")
+config_majors: dict[bytes, str] = _compile_hex("majors")
+config_hobbies: dict[bytes, str] = _compile_hex("hobbies")
+config_ltws: dict[bytes, str] = _compile_hex("ltws")
+config_trait_names: dict[bytes, str] = _compile_hex("traits")
+config_turnons: dict[int, str] = _compile_int("turnons")
+config_aspirations: dict[int, str] = _compile_int("aspirations")
+config_ages: dict[str, int] = {
+    i: config.getint("ages", i) for i in config.options("ages")
+}
+# gene options are lowercase, as ConfigParser lowercases option names
+config_genetics: dict[str, dict[str, str]] = {
+    i: dict(config.items(f"genetics.{i}"))
+    if config.has_section(f"genetics.{i}")
+    else {}
+    for i in ("skins", "hairs", "eyes")
+}
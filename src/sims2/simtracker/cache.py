@@ -0,0 +1,116 @@
+"""On-disk cache of the neighborhoods searched by SimTracker."""
+
+import os
+import pickle
+from dataclasses import dataclass, field
+from hashlib import blake2b
+from logging import Logger, getLogger
+from pathlib import Path
+from typing import Any, cast
+
+logger: Logger = getLogger(__name__)
+
+# filepath, size, and modification time (in ns) of a file
+type Stamp = tuple[str, int, int]
+
+VERSION: int = 1
+
+
+def stamp(path: Path) -> Stamp:
+    """Get the stamp of a file, which changes whenever the file is saved.
+
+    Args:
+        path: Filepath of the file.
+
+    Returns:
+        Filepath, size, and modification time of the file.
+    """
+    stat: os.stat_result = path.stat()
+    return os.fspath(path), stat.st_size, stat.st_mtime_ns
+
+
+@dataclass
+class NhoodEntry:
+    """Parsed files of a neighborhood saved in the cache.
+
+    Attributes:
+        version: Version of the cache format the entry was saved with.
+        config: Stamps of the config files the entry was parsed with.
+        package: Stamp of the neighborhood package and the pickled result of searching it, before characters and lots are added.
+        chars: Stamp and parsed result of each character file, by filepath.
+        lots: Stamp and parsed result of each lot, by lot ID.
+    """
+
+    version: int = VERSION
+    config: tuple[Stamp, ...] = ()
+    package: tuple[Stamp, bytes] | None = None
+    chars: dict[str, tuple[Stamp, Any]] = field(default_factory=dict)  # pyright: ignore[reportExplicitAny]
+    lots: dict[int, tuple[Stamp, Any]] = field(default_factory=dict)  # pyright: ignore[reportExplicitAny]
+
+
+class NhoodCache:
+    """On-disk cache of parsed neighborhoods.
+
+    Each neighborhood is saved to its own file, with every file it was parsed from recorded by path, size, and modification time, so a neighborhood that has not been saved since loads without parsing anything and only the files that have changed are parsed again otherwise. Entries parsed with a different config or cache format are ignored.
+
+    Attributes:
+        folder: Folder the cache files are saved in.
+    """
+
+    def __init__(self, folder: Path, config: tuple[Stamp, ...] = ()) -> None:
+        """Initialize the cache.
+
+        Args:
+            folder: Folder to save cache files in.
+            config: Stamps of the config files neighborhoods are parsed with.
+        """
+        self.folder: Path = folder
+        self._config: tuple[Stamp, ...] = config
+
+    def _path(self, directory: Path) -> Path:
+        key: bytes = str(directory.resolve()).encode()
+        name: str = blake2b(key, digest_size=16).hexdigest()
+        return self.folder / f"{name}.pickle"
+
+    def load(self, directory: Path) -> NhoodEntry:
+        """Load the cached files of a neighborhood.
+
+        Args:
+            directory: Folder of the neighborhood.
+
+        Returns:
+            The cached entry, or an empty entry if the neighborhood is not cached or the cache file can't be used.
+        """
+        entry: object
+        try:
+            with self._path(directory).open("rb") as file:
+                entry = cast("object", pickle.load(file))  # noqa: S301
+        except FileNotFoundError:
+            entry = None
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            logger.warning("could not load cache of neighborhood %s", directory)
+            entry = None
+        if (
+            not isinstance(entry, NhoodEntry)
+            or entry.version != VERSION
+            or entry.config != self._config
+        ):
+            return NhoodEntry(config=self._config)
+        return entry
+
+    def save(self, directory: Path, entry: NhoodEntry) -> None:
+        """Save the parsed files of a neighborhood.
+
+        Args:
+            directory: Folder of the neighborhood.
+            entry: Parsed files of the neighborhood.
+        """
+        path: Path = self._path(directory)
+        temp: Path = path.with_suffix(".tmp")
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            with temp.open("wb") as file:
+                pickle.dump(entry, file, protocol=pickle.HIGHEST_PROTOCOL)
+            _ = temp.replace(path)
+        except OSError:
+            logger.warning("could not save cache of neighborhood %s", directory)
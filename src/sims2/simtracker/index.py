@@ -0,0 +1,127 @@
+"""Index of the sims in every neighborhood."""
+
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+from sims2.simtracker.snapshot import NeighborhoodSnapshot
+
+
+class IndexedSim(NamedTuple):
+    """Sim recorded in the index.
+
+    Attributes:
+        nhood: Identifier of the neighborhood the sim lives in.
+        directory: Folder of the neighborhood the sim lives in.
+        nid: Neighbor ID of the sim.
+        name: Full name of the sim.
+        family: Name of the sim's family.
+        career: Name of the sim's career.
+        title: Sim's job title.
+        spnflags: Supernatural lifestates of the sim.
+    """
+
+    nhood: str
+    directory: Path
+    nid: bytes
+    name: str
+    family: str
+    career: str
+    title: str
+    spnflags: int
+
+
+class SimIndex:
+    """Searchable index of the sims in many neighborhoods.
+
+    Each neighborhood is added from a snapshot of it, replacing the sims of any earlier snapshot of the same neighborhood folder. Names, families, and careers are lowercased once when added so searches only compare strings.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty index."""
+        self._sims: dict[Path, list[tuple[IndexedSim, str, str, str]]] = {}
+
+    def add(self, snapshot: NeighborhoodSnapshot) -> None:
+        """Add the sims in a neighborhood to the index.
+
+        Args:
+            snapshot: Snapshot of the neighborhood.
+        """
+        sims: list[tuple[IndexedSim, str, str, str]] = []
+        nid: bytes
+        for nid in snapshot.sims:
+            sim = snapshot.sims[nid]
+            family = snapshot.families.get(sim.fam)
+            indexed: IndexedSim = IndexedSim(
+                snapshot.nhood,
+                snapshot.directory,
+                nid,
+                f"{sim.name[0]} {sim.name[1]}",
+                family.name if family is not None else "",
+                sim.job.career,
+                sim.job.title,
+                int(sim.spnflags),
+            )
+            sims.append(
+                (
+                    indexed,
+                    indexed.name.lower(),
+                    indexed.family.lower(),
+                    f"{indexed.career}\n{indexed.title}".lower(),
+                ),
+            )
+        self._sims[snapshot.directory] = sims
+
+    def clear(self) -> None:
+        """Remove every neighborhood from the index."""
+        self._sims.clear()
+
+    def __len__(self) -> int:
+        """Get number of sims in the index.
+
+        Returns:
+            Number of sims.
+        """
+        return sum(len(i) for i in self._sims.values())
+
+    def __iter__(self) -> Iterator[IndexedSim]:
+        """Iterate over the sims in the index, one neighborhood at a time.
+
+        Yields:
+            Each sim in the index.
+        """
+        sims: list[tuple[IndexedSim, str, str, str]]
+        for sims in self._sims.values():
+            yield from (i[0] for i in sims)
+
+    def search(
+        self,
+        *,
+        name: str = "",
+        career: str = "",
+        family: str = "",
+        lifestate: int = 0,
+    ) -> list[IndexedSim]:
+        """Find the sims matching every given condition.
+
+        Args:
+            name: Text in the sim's full name, ignoring case.
+            career: Text in the sim's career or job title, ignoring case.
+            family: Text in the name of the sim's family, ignoring case.
+            lifestate: Supernatural flags the sim must have all of.
+
+        Returns:
+            Matching sims, one neighborhood at a time.
+        """
+        name = name.lower()
+        career = career.lower()
+        family = family.lower()
+        return [
+            sim
+            for sims in self._sims.values()
+            for sim, sim_name, sim_family, sim_career in sims
+            if name in sim_name
+            and family in sim_family
+            and career in sim_career
+            and sim.spnflags & lifestate == lifestate
+        ]
@@ -1,45 +1,169 @@
 """Search neighborhood package for information about sims and families."""
 
+import pickle
+import re
+import time
 import xml.etree.ElementTree as ET
-from binascii import hexlify
+from collections.abc import Container, Iterable, Iterator
+from concurrent.futures import (
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+)
+from functools import partial
+from io import BytesIO
+from itertools import islice, pairwise
 from logging import Logger, getLogger
+from multiprocessing import get_context
 from pathlib import Path
-
-from sims2.dbpf import Resource, ResourceHeader, get_headers
-from sims2.simtracker._config import config, config_traits
-from sims2.simtracker.sim import Family, Sim, SupernaturalFlags
+from typing import Any, cast
+
+from sims2.common.logging import get_state_path
+from sims2.dbpf import IndexTable, Package, Resource, ResourceHeader
+from sims2.simtracker._config import (
+    config_ages,
+    config_genetics,
+    config_ltws,
+    config_paths,
+    config_trait_names,
+    config_traits,
+)
+from sims2.simtracker.cache import NhoodCache, NhoodEntry, Stamp, stamp
+from sims2.simtracker.sim import Family, Sim, SimGenes, SupernaturalFlags
+from sims2.simtracker.snapshot import NeighborhoodSnapshot
+from sims2.simtracker.table import SimTable
 
 logger: Logger = getLogger(__name__)
 
-sims: dict[bytes, Sim] = {}
-families: dict[bytes, Family] = {}
-
-
-def search_nhood(nhood: str, nhoods_folder: Path) -> None:
+nhood_cache: NhoodCache = NhoodCache(
+    get_state_path("simtracker") / "nhoods",
+    tuple(stamp(i) for i in config_paths if i.exists()),
+)
+
+# key of each gene in a sim's dna, with its config section, gene and allele
+_GENES: dict[str, tuple[str, str, str]] = {
+    "6": ("skins", "skin", "dominant"),
+    "268435462": ("skins", "skin", "recessive"),
+    "2": ("skins", "skin", "range1"),
+    "268435458": ("skins", "skin", "range2"),
+    "1": ("hairs", "hair", "dominant"),
+    "268435457": ("hairs", "hair", "recessive"),
+    "3": ("eyes", "eyes", "dominant"),
+    "268435459": ("eyes", "eyes", "recessive"),
+}
+# binary dna is a property set, where each string item is its data type, length
+# and text of its key, then length and text of its value
+_SDNA_GENE: re.Pattern[bytes] = re.compile(
+    b"\x18\xea\x8b\x0b("
+    + b"|".join(re.escape(len(i).to_bytes(4, "little") + i.encode()) for i in _GENES)
+    + b")(....)",
+    re.DOTALL,
+)
+
+_INVENTORY_SEPARATOR: bytes = b"\x00\x00\xbe\x00\x00\x00"
+
+
+def search_nhood(nhood: str, nhoods_folder: Path) -> NeighborhoodSnapshot:
     """Search neighborhood for information about sims and families.
 
+    Files that have not changed since the neighborhood was last searched are read from the neighborhood cache instead of being parsed again.
+
     Args:
         nhood: Identifier of neighborhood.
         nhoods_folder: Folder containing neighborhood.
-    """
-    sims.clear()
-    families.clear()
 
+    Returns:
+        Snapshot of the sims and families in the neighborhood.
+    """
     directory: Path = nhoods_folder / nhood
+    entry: NhoodEntry = nhood_cache.load(directory)
+    changed: bool = False
+
+    path: Path = directory / f"{nhood}_Neighborhood.package"
+    package_stamp: Stamp = stamp(path)
+    sims: SimTable
+    families: dict[bytes, Family]
+    guid2nid: dict[bytes, bytes]
+    if entry.package is not None and entry.package[0] == package_stamp:
+        logger.debug("loading neighborhood %s from cache", nhood)
+        sims, families, guid2nid = cast(
+            "tuple[SimTable, dict[bytes, Family], dict[bytes, bytes]]",
+            pickle.loads(entry.package[1]),  # noqa: S301
+        )
+    else:
+        with Package(path) as package:
+            logger.debug("searching neighborhood %s", nhood)
+            sims, families, guid2nid = _search_nhood_pkg(nhood, package)
+        entry.package = (
+            package_stamp,
+            pickle.dumps((sims, families, guid2nid), protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        changed = True
+
+    changed = _search_nhood_chars(sims, directory, guid2nid, entry.chars) or changed
+    changed = _search_nhood_lots(families, directory, nhood, entry.lots) or changed
+    if changed:
+        nhood_cache.save(directory, entry)
+
+    return NeighborhoodSnapshot(
+        nhood,
+        directory,
+        sims,
+        families,
+        files=(
+            package_stamp,
+            *(i[0] for i in entry.chars.values()),
+            *(i[0] for i in entry.lots.values()),
+        ),
+        searched=time.time(),
+    )
+
+
+def search_nhoods(
+    nhoods: Iterable[tuple[str, Path]],
+    workers: int | None = None,
+) -> Iterator[NeighborhoodSnapshot]:
+    """Search many neighborhoods at once, each in its own process.
+
+    Neighborhoods that can't be searched are logged and skipped.
 
-    with (directory / f"{nhood}_Neighborhood.package").open("rb") as file:
-        logger.debug("searching neighborhood %s", nhood)
-        package: bytes = file.read()
-
-    guid2nid: dict[bytes, bytes] = _search_nhood_pkg(nhood, package)
-
-    _search_nhood_chars(directory, guid2nid)
-    _search_nhood_lots(directory, nhood)
-
+    Args:
+        nhoods: Identifier of each neighborhood and the folder containing it.
+        workers: Number of processes to search neighborhoods with (number of CPUs if not given).
 
-def _search_nhood_pkg(nhood: str, package: bytes) -> dict[bytes, bytes]:
+    Yields:
+        Snapshot of each neighborhood, as soon as it has been searched.
+    """
+    # workers are spawned as neighborhoods may be searched from a thread, which is not
+    # safe to fork from
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=get_context("spawn"),
+    ) as executor:
+        futures: dict[Future[NeighborhoodSnapshot], str] = {
+            executor.submit(search_nhood, nhood, folder): nhood
+            for nhood, folder in nhoods
+        }
+        future: Future[NeighborhoodSnapshot]
+        for future in as_completed(futures):
+            try:
+                snapshot: NeighborhoodSnapshot = future.result()
+            except Exception:
+                logger.exception("could not search neighborhood %s", futures[future])
+                continue
+            yield snapshot
+
+
+def _search_nhood_pkg(
+    nhood: str,
+    package: Package,
+) -> tuple[SimTable, dict[bytes, Family], dict[bytes, bytes]]:
+    sims: SimTable = SimTable()
+    families: dict[bytes, Family] = {}
     nids: list[bytes] = []
     guid2nid: dict[bytes, bytes] = {}
+    sdscs: list[tuple[bytes, bytes]] = []
 
     inventory: Resource | None = None
     strs: list[ResourceHeader] = []
@@ -47,8 +171,21 @@ def _search_nhood_pkg(nhood: str, package: bytes) -> dict[bytes, bytes]:
     dnas: list[ResourceHeader] = []
     wants: list[ResourceHeader] = []
 
+    table: IndexTable = IndexTable(package)
     header: ResourceHeader
-    for header in get_headers(package):
+    for header in table.headers(
+        table.mask(
+            rtypes=[
+                b"HBGN",
+                b"\xfb\x2e\xce\xaa",
+                b"IMAF",
+                b"#RTS",
+                b"\xe7\x99\xf9\x0b",
+                b"\x3f\xe3\xfe\xeb",
+                b"\x8e\x54\x95\xcd",
+            ],
+        ),
+    ):
         match header.rtype:
             case b"HBGN":
                 inventory = Resource(package, header)
@@ -58,7 +195,7 @@ def _search_nhood_pkg(nhood: str, package: bytes) -> dict[bytes, bytes]:
                     nhood != "N001"
                     and int.from_bytes(resource[148:150], byteorder="little") > 0
                 ):
-                    sims[resource[474:476]] = Sim(resource)
+                    sdscs.append((resource[474:476], resource))
                     guid2nid[resource[476:480]] = resource[474:476]
                     nids.append(resource[474:476])
             case b"IMAF":
@@ -79,16 +216,22 @@ def _search_nhood_pkg(nhood: str, package: bytes) -> dict[bytes, bytes]:
             case _:
                 pass
 
-    _search_nhood_strs(strs, package)
-    _search_nhood_business_owners(owners)
-    _search_nhood_sdna(dnas, package)
-    _search_nhood_wants(wants, package)
-    _search_nhood_inventory(inventory, nids)
+    sims.load(sdscs)
+
+    _search_nhood_strs(families, strs, package)
+    _search_nhood_business_owners(sims, owners)
+    _search_nhood_sdna(sims, dnas, package)
+    _search_nhood_wants(sims, wants, package)
+    _search_nhood_inventory(sims, inventory, nids)
 
-    return guid2nid
+    return sims, families, guid2nid
 
 
-def _search_nhood_strs(strs: list[ResourceHeader], package: bytes) -> None:
+def _search_nhood_strs(
+    families: dict[bytes, Family],
+    strs: list[ResourceHeader],
+    package: Package,
+) -> None:
     header: ResourceHeader
     for header in strs:
         i: bytes = header.instance[:2]
@@ -101,7 +244,7 @@ def _search_nhood_strs(strs: list[ResourceHeader], package: bytes) -> None:
                 families[i].desc = name[desc_index].split(b"\x00")[0].decode("utf-8")
 
 
-def _search_nhood_business_owners(owners: list[bytes]) -> None:
+def _search_nhood_business_owners(sims: SimTable, owners: list[bytes]) -> None:
     owner: bytes
     for owner in owners:
         if owner != b"\x00\x00" and owner in sims and not sims[owner].job.career:
@@ -109,226 +252,339 @@ def _search_nhood_business_owners(owners: list[bytes]) -> None:
             sims[owner].job.title = "Owner"
 
 
-def _search_nhood_sdna(dnas: list[ResourceHeader], package: bytes) -> None:
+def _search_nhood_sdna(
+    sims: SimTable,
+    dnas: list[ResourceHeader],
+    package: Package,
+) -> None:
     header: ResourceHeader
     for header in dnas:
         nid: bytes = header.instance[:2]
-        if nid not in sims or sims[nid].species != b"\x00\x00":
+        if nid not in sims or sims.value(nid, "species") != 0:
             continue
         resource: bytes = Resource(package, header).contents
-        if resource[:4] == b"\xe0\x50\xe7\xcb":
-            sims[nid].genes.skin.dominant = config.get(
-                "genetics.skins",
-                resource.split(b"6$\x00\x00\x00")[1][:36].decode("utf-8"),
-                fallback="Custom",
-            )
-            sims[nid].genes.skin.recessive = config.get(
-                "genetics.skins",
-                resource.split(b"268435462$\x00\x00\x00")[1][:36].decode("utf-8"),
-                fallback="Custom",
-            )
-            sims[nid].genes.skin.range1 = config.get(
-                "genetics.skins",
-                resource.split(b"2$\x00\x00\x00")[1][:36].decode("utf-8"),
-                fallback="Custom",
-            )
-            sims[nid].genes.skin.range2 = config.get(
-                "genetics.skins",
-                resource.split(b"268435458$\x00\x00\x00")[1][:36].decode("utf-8"),
-                fallback="Custom",
-            )
-            sims[nid].genes.hair.dominant = config.get(
-                "genetics.hairs",
-                resource.split(b"1$\x00\x00\x00")[1][:36].decode("utf-8"),
-                fallback="Custom",
-            )
-            sims[nid].genes.hair.recessive = config.get(
-                "genetics.hairs",
-                resource.split(b"268435457$\x00\x00\x00")[1][:36].decode("utf-8"),
-                fallback="Custom",
-            )
-            sims[nid].genes.eyes.dominant = config.get(
-                "genetics.eyes",
-                resource.split(b"3$\x00\x00\x00")[1][:36].decode("utf-8"),
-                fallback="Custom",
-            )
-            sims[nid].genes.eyes.recessive = config.get(
-                "genetics.eyes",
-                resource.split(b"268435459$\x00\x00\x00")[1][:36].decode("utf-8"),
-                fallback="Custom",
+        values: dict[str, str | None] = (
+            _read_sdna_binary(resource)
+            if resource[:4] == b"\xe0\x50\xe7\xcb"
+            else _read_sdna_xml(resource)
+        )
+        missing: list[str] = [i for i in _GENES if i not in values]
+        if missing:
+            logger.warning(
+                "genes missing from dna of sim %s: %s",
+                nid.hex(),
+                ", ".join(missing),
             )
-        else:
-            xmlroot: ET.Element = ET.fromstring(resource.decode("utf-8"))
-
-            def get_txt_from_xml(section: str, xmlroot: ET.Element, key: int) -> str:
-                xmltree: ET.Element | None = xmlroot.find(f"./AnyString[@key='{key}']")
-                if xmltree is None:
-                    return "Custom"
-                if xmltree.text is None:
-                    return "Custom"
-                return config.get(
-                    f"genetics.{section}",
-                    xmltree.text,
-                    fallback="Custom",
-                )
 
-            sims[nid].genes.skin.dominant = get_txt_from_xml("skins", xmlroot, 6)
-            sims[nid].genes.skin.recessive = get_txt_from_xml(
-                "skins",
-                xmlroot,
-                268435462,
-            )
-            sims[nid].genes.skin.range1 = get_txt_from_xml("skins", xmlroot, 2)
-            sims[nid].genes.skin.range2 = get_txt_from_xml("skins", xmlroot, 268435458)
-            sims[nid].genes.hair.dominant = get_txt_from_xml("hairs", xmlroot, 1)
-            sims[nid].genes.hair.recessive = get_txt_from_xml(
-                "hairs",
-                xmlroot,
-                268435457,
-            )
-            sims[nid].genes.eyes.dominant = get_txt_from_xml("eyes", xmlroot, 3)
-            sims[nid].genes.eyes.recessive = get_txt_from_xml(
-                "eyes",
-                xmlroot,
-                268435459,
+        genes: SimGenes = sims[nid].genes
+        key: str
+        section: str
+        gene: str
+        allele: str
+        for key, (section, gene, allele) in _GENES.items():
+            value: str | None = values.get(key)
+            setattr(
+                getattr(genes, gene),
+                allele,
+                "Custom"
+                if value is None
+                else config_genetics[section].get(value.lower(), "Custom"),
             )
 
 
-def _search_nhood_wants(wants: list[ResourceHeader], package: bytes) -> None:
+def _read_sdna_binary(resource: bytes) -> dict[str, str | None]:
+    values: dict[str, str | None] = {}
+    match: re.Match[bytes]
+    for match in _SDNA_GENE.finditer(resource):
+        key: str = match[1][4:].decode("utf-8")
+        if key not in values:
+            end: int = match.end() + int.from_bytes(match[2], byteorder="little")
+            if end > len(resource):
+                break
+            values[key] = resource[match.end() : end].decode("utf-8")
+            if len(values) == len(_GENES):
+                break
+    return values
+
+
+def _read_sdna_xml(resource: bytes) -> dict[str, str | None]:
+    values: dict[str, str | None] = {}
+    element: ET.Element
+    for _, element in ET.iterparse(BytesIO(resource)):
+        if element.tag == "AnyString":
+            key: str | None = element.get("key")
+            if key in _GENES and key not in values:
+                values[key] = element.text
+        element.clear()
+    return values
+
+
+def _search_nhood_wants(
+    sims: SimTable,
+    wants: list[ResourceHeader],
+    package: Package,
+) -> None:
     header: ResourceHeader
     for header in wants:
         nid: bytes = header.instance[:2]
         if (
             nid not in sims
-            or sims[nid].species != b"\x00\x00"
-            or sims[nid].age < config.getint("ages", "teen")
+            or sims.value(nid, "species") != 0
+            or sims[nid].age < config_ages["teen"]
         ):
             continue
-        sims[nid].ltw = config.get(
-            "ltws",
-            str(hexlify(Resource(package, header).contents[14:18])),
-            fallback="Custom",
+        sims[nid].ltw = config_ltws.get(
+            Resource(package, header).contents[14:18],
+            "Custom",
         )
 
 
-def _search_nhood_inventory(inventory: Resource | None, nids: list[bytes]) -> None:
-    if inventory is None:
+def _search_nhood_inventory(
+    sims: SimTable,
+    inventory: Resource | None,
+    nids: list[bytes],
+) -> None:
+    if inventory is None or not nids:
         return
 
-    try:
-        resource: bytes = inventory.contents[
-            inventory.contents.index(b"\xff\x7f\x00\x00\xbe\x00\x00\x00") :
-        ]
-    except (KeyError, ValueError):
-        resource = inventory.contents
-    res: list[bytes] = resource.split(b"\x00\x00\xbe\x00\x00\x00")
-    nid: bytes = nids[0]
-    for i in range(2, len(res)):
-        if (nids.index(nid) < len(nids) - 1) and res[i - 1][-2:] == nids[
-            nids.index(nid) + 1
-        ]:
-            nid = res[i - 1][-2:]
-        if sims[nid].species != b"\x00\x00":
+    contents: bytes = inventory.contents
+    start: int = max(contents.find(b"\xff\x7f" + _INVENTORY_SEPARATOR), 0)
+
+    # index of the first appearance of each neighbor id
+    positions: dict[bytes, int] = {nid: i for i, nid in reversed(list(enumerate(nids)))}
+
+    # each sim's inventory follows a separator, with the next sim's neighbor id
+    # at the end of the previous inventory
+    position: int = 0
+    previous: tuple[int, int]
+    current: tuple[int, int]
+    for previous, current in pairwise(
+        islice(_split(contents, _INVENTORY_SEPARATOR, start, len(contents)), 1, None),
+    ):
+        if position < len(nids) - 1 and (
+            contents[max(previous[0], previous[1] - 2) : previous[1]]
+            == nids[position + 1]
+        ):
+            position = positions[nids[position + 1]]
+        nid: bytes = nids[position]
+        if sims.value(nid, "species") != 0:
             continue
-        _search_sim_inventory(res[i], sims[nid])
-
-    sim: Sim
-    for sim in sims.values():
-        sim.set_aspirations()
-        if config_traits:
-            for _ in range(len(sim.traits), 5):
-                sim.traits.append("")
-
-
-def _search_sim_inventory(inventory: bytes, sim: Sim) -> None:
-    if b"\x89\x89\xd0\x53" in inventory:
-        index: int = inventory.index(b"\x89\x89\xd0\x53") + 18
-        sim.asp[1] = int.from_bytes(inventory[index : index + 2], byteorder="little")
+        _search_sim_inventory(contents, *current, sims[nid])
+
+    sims.finalize()
+
+
+def _split(
+    contents: bytes,
+    separator: bytes,
+    start: int,
+    end: int,
+) -> Iterator[tuple[int, int]]:
+    # bounds of each piece of contents[start:end] split on separator, without copying
+    index: int = contents.find(separator, start, end)
+    while index >= 0:
+        yield start, index
+        start = index + len(separator)
+        index = contents.find(separator, start, end)
+    yield start, end
+
+
+def _search_sim_inventory(contents: bytes, start: int, end: int, sim: Sim) -> None:
+    index: int = contents.find(b"\x89\x89\xd0\x53", start, end)
+    if index >= 0:
+        index += 18
+        sim.asp[1] = int.from_bytes(
+            contents[index : min(index + 2, end)],
+            byteorder="little",
+        )
 
     if config_traits:
-        items: list[bytes] = inventory.split(b"\xbb\x87\x00")
-        if len(items) > 1:
-            item: bytes
-            for item in items:
+        piece: int
+        stop: int
+        if contents.find(b"\xbb\x87\x00", start, end) >= 0:
+            for piece, stop in _split(contents, b"\xbb\x87\x00", start, end):
                 sim.traits.append(
-                    config.get("traits", str(hexlify(item[-1:])), fallback="Unknown"),
+                    config_trait_names.get(
+                        contents[max(piece, stop - 1) : stop],
+                        "Unknown",
+                    ),
                 )
 
-        items = inventory.split(b"\xbb\x8e\x00")
-        for item in items:
-            match item[-1:]:
+        for piece, stop in _split(contents, b"\xbb\x8e\x00", start, end):
+            match contents[max(piece, stop - 2) : stop]:
                 case b"\x8b\x27":
-                    sim.spnflags += SupernaturalFlags.MERMAID
+                    sim.spnflags |= SupernaturalFlags.MERMAID
                 case b"\x75\x27":
-                    sim.spnflags += SupernaturalFlags.GENIE
+                    sim.spnflags |= SupernaturalFlags.GENIE
                 case b"\x76\x27":
-                    sim.spnflags += SupernaturalFlags.FAIRY
+                    sim.spnflags |= SupernaturalFlags.FAIRY
                 case b"\x9b\x27":
-                    sim.spnflags += SupernaturalFlags.GHOST
+                    sim.spnflags |= SupernaturalFlags.GHOST
                 case _:
                     pass
 
 
-def _search_nhood_chars(directory: Path, guid2nid: dict[bytes, bytes]) -> None:
-    char: Path
-    for char in (directory / "Characters").iterdir():
-        with char.open("rb") as file:
-            logger.debug("reading file: %s", char.name)
-            package: bytes = file.read()
+def _search_nhood_chars(
+    sims: SimTable,
+    directory: Path,
+    guid2nid: dict[bytes, bytes],
+    cached: dict[str, tuple[Stamp, Any]],  # pyright: ignore[reportExplicitAny]
+) -> bool:
+    chars: list[Path] = list((directory / "Characters").iterdir())
+    stamps: list[Stamp] = [stamp(char) for char in chars]
+    characters: list[tuple[bytes, tuple[str, str, str] | None]] = []
+    todo: list[int] = []
+    i: int
+    for i, char in enumerate(chars):
+        hit: tuple[Stamp, Any] | None = cached.get(str(char))  # pyright: ignore[reportExplicitAny]
+        # characters that weren't in the neighborhood before have no names cached
+        if (
+            hit is None
+            or hit[0] != stamps[i]
+            or (hit[1][1] is None and hit[1][0] in guid2nid)
+        ):
+            todo.append(i)
+            characters.append((b"", None))
+        else:
+            characters.append(hit[1])
+
+    with ThreadPoolExecutor() as executor:
+        character: tuple[bytes, tuple[str, str, str] | None]
+        for i, character in zip(
+            todo,
+            executor.map(
+                partial(_read_char, guids=guid2nid.keys()),
+                (chars[i] for i in todo),
+            ),
+            strict=True,
+        ):
+            characters[i] = character
+            cached[str(chars[i])] = (stamps[i], character)
 
-        name: list[bytes] = []
-        guid: bytes = b""
+    removed: set[str] = cached.keys() - {str(char) for char in chars}
+    for char in removed:
+        del cached[char]
 
-        header: ResourceHeader
-        for header in get_headers(package):
-            match header.rtype:
-                case b"DJBO":
-                    guid = Resource(package, header).contents[92:96]
-                case b"SSTC":
-                    name = Resource(package, header).contents[68:].split(b"\x01")
-                case _:
-                    pass
-
-        if guid not in guid2nid:
+    guid: bytes
+    names: tuple[str, str, str] | None
+    for guid, names in characters:
+        if names is None or guid not in guid2nid:
             continue
-        nid: bytes = guid2nid[guid]
-        sims[nid].name[0] = name[1].split(b"\x00")[0].decode("utf-8")
-        if sims[nid].name[0][:6] == "Prof. ":
-            sims[nid].name[0] = sims[nid].name[0][6:]
-        sims[nid].bio = name[2].split(b"\x00")[0].decode("utf-8")
-        sims[nid].name[1] = name[3].split(b"\x00")[0].decode("utf-8")
-
-
-def _search_nhood_lots(directory: Path, nhood: str) -> None:
+        sim: Sim = sims[guid2nid[guid]]
+        sim.name[0], sim.bio, sim.name[1] = names
+
+    return bool(todo or removed)
+
+
+def _read_char(
+    char: Path,
+    guids: Container[bytes],
+) -> tuple[bytes, tuple[str, str, str] | None]:
+    # guid and first name, bio and surname of a character, if it is one of the guids
+    name: list[bytes] = []
+    guid: bytes = b""
+
+    with Package(char, lazy=True) as package:
+        logger.debug("reading file: %s", char.name)
+
+        table: IndexTable = IndexTable(package)
+        headers: dict[bytes, ResourceHeader] = {
+            header.rtype: header
+            for header in table.headers(table.mask(rtypes=[b"DJBO", b"SSTC"]))
+        }
+        if b"DJBO" in headers:
+            guid = Resource(package, headers[b"DJBO"]).contents[92:96]
+        if guid not in guids:
+            return guid, None
+        if b"SSTC" in headers:
+            name = Resource(package, headers[b"SSTC"]).contents[68:].split(b"\x01")
+
+    first: str = name[1].split(b"\x00")[0].decode("utf-8")
+    if first[:6] == "Prof. ":
+        first = first[6:]
+    return guid, (
+        first,
+        name[2].split(b"\x00")[0].decode("utf-8"),
+        name[3].split(b"\x00")[0].decode("utf-8"),
+    )
+
+
+def _search_nhood_lots(
+    families: dict[bytes, Family],
+    directory: Path,
+    nhood: str,
+    cached: dict[int, tuple[Stamp, Any]],  # pyright: ignore[reportExplicitAny]
+) -> bool:
     directory /= "Lots"
+    lots: dict[int, list[Family]] = {}
     family: Family
     for family in families.values():
-        lot: int = family.lot
-        if lot > 0:
-            with (directory / f"{nhood}_Lot{lot}.package").open("rb") as file:
-                logger.debug("searching lot %s in neighborhood %s", lot, nhood)
-                package: bytes = file.read()
-
-            header: ResourceHeader
-            for header in get_headers(package):
-                match header.rtype:
-                    case b"IMIS":
-                        resource: bytes = Resource(package, header).contents
-                        family.time = f"{int.from_bytes(resource[76:78], byteorder='little')}:{int.from_bytes(resource[86:88], byteorder='little'):02d}"
-                        family.day = int.from_bytes(
-                            resource[132:134],
-                            byteorder="little",
-                        )
-                    case b"\x8b\xe2\x1b\xb2":
-                        resource = Resource(package, header).contents
-                        index: int = int.from_bytes(resource[4:8], byteorder="little")
-                        family.season = int.from_bytes(
-                            resource[index + 12 : index + 16],
-                            byteorder="little",
-                        )
-                        family.ssnlngth = int.from_bytes(
-                            resource[index + 16 : index + 20],
-                            byteorder="little",
-                        )
-                    case _:
-                        pass
+        if family.lot > 0:
+            lots.setdefault(family.lot, []).append(family)
+
+    stamps: dict[int, Stamp] = {
+        lot: stamp(directory / f"{nhood}_Lot{lot}.package") for lot in lots
+    }
+    todo: list[int] = []
+    lot: int
+    residents: list[Family]
+    for lot, residents in lots.items():
+        hit: tuple[Stamp, Any] | None = cached.get(lot)  # pyright: ignore[reportExplicitAny]
+        if hit is not None and hit[0] == stamps[lot]:
+            _set_lot(residents, hit[1])
+        else:
+            todo.append(lot)
+
+    with ThreadPoolExecutor() as executor:
+        future: Future[Family]
+        for future in as_completed(
+            executor.submit(_read_lot, directory, nhood, lot) for lot in todo
+        ):
+            result: Family = future.result()
+            cached[result.lot] = (stamps[result.lot], result)
+            _set_lot(lots[result.lot], result)
+
+    removed: set[int] = cached.keys() - lots.keys()
+    for lot in removed:
+        del cached[lot]
+
+    return bool(todo or removed)
+
+
+def _set_lot(families: list[Family], result: Family) -> None:
+    family: Family
+    for family in families:
+        family.day = result.day
+        family.time = result.time
+        family.season = result.season
+        family.ssnlngth = result.ssnlngth
+
+
+def _read_lot(directory: Path, nhood: str, lot: int) -> Family:
+    # day, time and season of a lot, read into a family living there
+    family: Family = Family(lot)
+    with Package(directory / f"{nhood}_Lot{lot}.package", lazy=True) as package:
+        logger.debug("searching lot %s in neighborhood %s", lot, nhood)
+
+        table: IndexTable = IndexTable(package)
+        header: ResourceHeader
+        for header in table.headers(table.mask(rtypes=[b"IMIS", b"\x8b\xe2\x1b\xb2"])):
+            match header.rtype:
+                case b"IMIS":
+                    resource: bytes = Resource(package, header).contents
+                    family.time = f"{int.from_bytes(resource[76:78], byteorder='little')}:{int.from_bytes(resource[86:88], byteorder='little'):02d}"
+                    family.day = int.from_bytes(resource[132:134], byteorder="little")
+                case b"\x8b\xe2\x1b\xb2":
+                    resource = Resource(package, header).contents
+                    index: int = int.from_bytes(resource[4:8], byteorder="little")
+                    family.season = int.from_bytes(
+                        resource[index + 12 : index + 16],
+                        byteorder="little",
+                    )
+                    family.ssnlngth = int.from_bytes(
+                        resource[index + 16 : index + 20],
+                        byteorder="little",
+                    )
+                case _:
+                    pass
+    return family
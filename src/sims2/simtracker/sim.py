@@ -1,11 +1,22 @@
 """Classes for handling TS2 Sims and Families."""
 
-from binascii import hexlify
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from enum import IntFlag, auto
 from math import log2
-
-from sims2.simtracker._config import config, config_traits
+from struct import Struct, calcsize
+from typing import NamedTuple, Self, cast
+
+from sims2.simtracker._config import (
+    config_ages,
+    config_aspirations,
+    config_careers,
+    config_hobbies,
+    config_majors,
+    config_midge,
+    config_npcs,
+    config_traits,
+    config_turnons,
+)
 
 
 @dataclass
@@ -254,6 +265,209 @@ class TurnOns3(IntFlag):
     WITCH = auto()
 
 
+# name, offset, and struct format of each SDSC field that is read, in order of offset
+SDSC_LAYOUT: tuple[tuple[str, int, str], ...] = (
+    *(
+        (f"personality_{i.name}", offset, "H")
+        for i, offset in zip(
+            fields(SimPersonality),
+            (16, 18, 22, 24, 26),
+            strict=True,
+        )
+    ),
+    *(
+        (f"skill_{i.name}", offset, "H")
+        for i, offset in zip(
+            fields(SimSkills),
+            (30, 32, 34, 36, 42, 46, 48),
+            strict=True,
+        )
+    ),
+    ("pref_male", 56, "H"),
+    ("pref_female", 58, "H"),
+    ("aspiration", 104, "H"),
+    ("career_level", 126, "H"),
+    ("lifestage", 128, "2s"),
+    ("family", 134, "2s"),
+    ("ghost_flags", 148, "H"),
+    ("person_flags1", 180, "H"),
+    ("career", 190, "4s"),
+    ("lifespan", 194, "H"),
+    ("age_days", 196, "H"),
+    *(
+        (f"interest_{i.name}", 260 + 2 * n, "H")
+        for n, i in enumerate(fields(SimInterests))
+    ),
+    ("npc_type", 322, "2s"),
+    ("prev_age_days", 324, "H"),
+    ("person_flags2", 330, "H"),
+    ("major", 352, "4s"),
+    ("to_trait1", 372, "H"),
+    ("to_trait2", 374, "H"),
+    ("turnon1", 376, "H"),
+    ("turnon2", 378, "H"),
+    ("turnoff1", 380, "H"),
+    ("turnoff2", 382, "H"),
+    ("species", 384, "2s"),
+    ("turnon3", 414, "H"),
+    ("turnoff3", 416, "H"),
+    ("to_trait3", 418, "H"),
+    *((f"hobby_{i.name}", 420 + 2 * n, "H") for n, i in enumerate(fields(SimHobbies))),
+    ("oth", 442, "2s"),
+    ("lta", 444, "H"),
+    ("lta_benefits_earned", 446, "H"),
+    ("lta_benefits_spent", 448, "H"),
+)
+
+
+def compile_layout(layout: tuple[tuple[str, int, str], ...]) -> Struct:
+    """Compile a layout of fields into a struct that unpacks all of them at once.
+
+    Args:
+        layout: Name, offset, and struct format of each field, in order of offset.
+
+    Returns:
+        Little-endian struct skipping the bytes between fields.
+
+    Raises:
+        ValueError: If fields overlap.
+    """
+    fmt: str = "<"
+    pos: int = 0
+    offset: int
+    code: str
+    for _, offset, code in layout:
+        if offset < pos:
+            msg = f"overlapping field at offset {offset}"
+            raise ValueError(msg)
+        if offset > pos:
+            fmt += f"{offset - pos}x"
+        fmt += code
+        pos = offset + calcsize(f"<{code}")
+    return Struct(fmt)
+
+
+SDSC: Struct = compile_layout(SDSC_LAYOUT)
+
+
+class SDSCRecord(NamedTuple):
+    """Fields of an SDSC resource, in the order of SDSC_LAYOUT."""
+
+    personality_nice: int
+    personality_active: int
+    personality_playful: int
+    personality_outgoing: int
+    personality_neat: int
+    skill_cleaning: int
+    skill_cooking: int
+    skill_charisma: int
+    skill_mechanical: int
+    skill_creativity: int
+    skill_body: int
+    skill_logic: int
+    pref_male: int
+    pref_female: int
+    aspiration: int
+    career_level: int
+    lifestage: bytes
+    family: bytes
+    ghost_flags: int
+    person_flags1: int
+    career: bytes
+    lifespan: int
+    age_days: int
+    interest_politics: int
+    interest_money: int
+    interest_environment: int
+    interest_crime: int
+    interest_entertainment: int
+    interest_culture: int
+    interest_food: int
+    interest_health: int
+    interest_fashion: int
+    interest_sports: int
+    interest_paranormal: int
+    interest_travel: int
+    interest_work: int
+    interest_weather: int
+    interest_animals: int
+    interest_school: int
+    interest_toys: int
+    interest_scifi: int
+    npc_type: bytes
+    prev_age_days: int
+    person_flags2: int
+    major: bytes
+    to_trait1: int
+    to_trait2: int
+    turnon1: int
+    turnon2: int
+    turnoff1: int
+    turnoff2: int
+    species: bytes
+    turnon3: int
+    turnoff3: int
+    to_trait3: int
+    hobby_cuisine: int
+    hobby_art: int
+    hobby_lit: int
+    hobby_sports: int
+    hobby_games: int
+    hobby_nature: int
+    hobby_tinkering: int
+    hobby_fitness: int
+    hobby_science: int
+    hobby_music: int
+    oth: bytes
+    lta: int
+    lta_benefits_earned: int
+    lta_benefits_spent: int
+
+
+# fields are spelled out for type checkers, so make sure they still match the layout
+if tuple(SDSCRecord.__annotations__.items()) != tuple(
+    (name, bytes if code.endswith("s") else int) for name, _, code in SDSC_LAYOUT
+):
+    msg = "SDSCRecord does not match SDSC_LAYOUT"
+    raise TypeError(msg)
+
+
+def _group(prefix: str) -> slice:
+    names: list[str] = [i[0] for i in SDSC_LAYOUT]
+    start: int = next(n for n, i in enumerate(names) if i.startswith(prefix))
+    group: slice = slice(start, start + sum(i.startswith(prefix) for i in names))
+    if any(i[2] != "H" for i in SDSC_LAYOUT[group]):
+        msg = f"{prefix} fields are not all integers"
+        raise TypeError(msg)
+    return group
+
+
+def _levels(record: SDSCRecord, group: slice) -> list[int]:
+    # every field of a group is an integer, as checked by _group
+    return [i // 100 for i in cast("tuple[int, ...]", record[group])]
+
+
+_PERSONALITY: slice = _group("personality_")
+_SKILLS: slice = _group("skill_")
+_INTERESTS: slice = _group("interest_")
+_HOBBIES: slice = _group("hobby_")
+
+# plain int values of flags, which are much faster to test than IntFlag members
+_TURNON_FLAGS: tuple[tuple[int, ...], ...] = tuple(
+    tuple(int(i) for i in flags) for flags in (TurnOns1, TurnOns2, TurnOns3)
+)
+_SUPERNATURAL_FLAGS: tuple[tuple[int, int], ...] = tuple(
+    (int(i), int(j))
+    for i, j in (
+        (PersonFlags1.ZOMBIE, SupernaturalFlags.ZOMBIE),
+        (PersonFlags1.VAMPIRE, SupernaturalFlags.VAMPIRE),
+        (PersonFlags1.WEREWOLF, SupernaturalFlags.WEREWOLF),
+        (PersonFlags1.PLANTSIM, SupernaturalFlags.PLANTSIM),
+        (PersonFlags1.WITCH, SupernaturalFlags.WITCH),
+    )
+)
+
+
 # pylint: disable=too-many-instance-attributes
 class Sim:
     """A TS2 Sim.
@@ -287,86 +501,73 @@ class Sim:
     def __init__(self, resource: bytes) -> None:
         """Initialize Sim from SDSC resource.
 
+        Every field is unpacked in a single call using the compiled SDSC layout, with fields past the end of a short resource read as zero.
+
         Args:
             resource: Contents of SDSC.
         """
+        if len(resource) < SDSC.size:
+            resource = resource.ljust(SDSC.size, b"\x00")
+        self._decode(SDSCRecord._make(SDSC.unpack_from(resource)))
+
+    @classmethod
+    def from_record(cls, record: SDSCRecord) -> Self:
+        """Initialize Sim from the already unpacked fields of an SDSC resource.
+
+        Args:
+            record: SDSCRecord of the fields of the SDSC.
+
+        Returns:
+            Sim described by the SDSC.
+        """
+        sim: Self = cls.__new__(cls)
+        sim._decode(record)
+        return sim
+
+    def _decode(self, record: SDSCRecord) -> None:
         self.name: list[str] = ["Unknown", "Unknown"]
         self.bio: str = ""
         self.genes: SimGenes = SimGenes()
-        self.personality: SimPersonality = self._get_personality(resource)
-        self.skills: SimSkills = self._get_skills(resource)
-        self.sexuality: str = self._get_sexuality(resource[56:60])
-        self.asp: list[int | str] = [
-            int.from_bytes(resource[104:106], byteorder="little"),
-            "",
-        ]
+        self.personality: SimPersonality = SimPersonality(
+            *_levels(record, _PERSONALITY),
+        )
+        self.skills: SimSkills = SimSkills(*_levels(record, _SKILLS))
+        self.sexuality: str = self._get_sexuality(record.pref_male, record.pref_female)
+        self.asp: list[int | str] = [record.aspiration, ""]
         self.ltw: str = ""
-        self.fam: bytes = resource[134:136]
-        self.spnflags: int = self._get_supernatural(resource)
-        self.species: bytes = resource[384:386]
-        self.job: SimCareer = self._get_job(resource)
+        self.fam: bytes = record.family
+        self.spnflags: int = self._get_supernatural(record)
+        self.species: bytes = record.species
+        self.job: SimCareer = self._get_job(record)
         self.age: int
         self.death: int
-        self.age, self.death = self._get_age(resource)
-        self.interests: SimInterests = self._get_interests(resource)
-
-        if self.age >= config.getint("ages", "adult"):
-            self.major: str = config.get(
-                "majors",
-                str(hexlify(resource[352:356])),
-                fallback="Custom",
-            )
+        self.age, self.death = self._get_age(record)
+        self.interests: SimInterests = SimInterests(
+            *_levels(record, _INTERESTS),
+        )
+
+        if self.age >= config_ages["adult"]:
+            self.major: str = config_majors.get(record.major, "Custom")
         else:
             self.major = ""
 
         self.to_traits: list[int] = [
-            int.from_bytes(resource[372:374], byteorder="little"),
-            int.from_bytes(resource[374:376], byteorder="little"),
-            int.from_bytes(resource[418:420], byteorder="little"),
+            record.to_trait1,
+            record.to_trait2,
+            record.to_trait3,
         ]
-        self.tos: list[str] = self._get_turnons(resource)
+        self.tos: list[str] = self._get_turnons(record)
 
-        self.hobbies: SimHobbies = self._get_hobbies(resource)
-        self.oth: str = config.get(
-            "hobbies",
-            str(hexlify(resource[442:444])),
-            fallback="Unknown",
-        )
-        self.lta: int = int.from_bytes(resource[444:446], byteorder="little")
-        self.lta_benefits: int = int.from_bytes(
-            resource[446:448],
-            byteorder="little",
-        ) - int.from_bytes(resource[448:450], byteorder="little")
+        self.hobbies: SimHobbies = SimHobbies(*_levels(record, _HOBBIES))
+        self.oth: str = config_hobbies.get(record.oth, "Unknown")
+        self.lta: int = record.lta
+        self.lta_benefits: int = record.lta_benefits_earned - record.lta_benefits_spent
 
         if config_traits:
             self.traits: list[str] = []
 
     @staticmethod
-    def _get_personality(resource: bytes) -> SimPersonality:
-        return SimPersonality(
-            int.from_bytes(resource[16:18], byteorder="little") // 100,
-            int.from_bytes(resource[18:20], byteorder="little") // 100,
-            int.from_bytes(resource[22:24], byteorder="little") // 100,
-            int.from_bytes(resource[24:26], byteorder="little") // 100,
-            int.from_bytes(resource[26:28], byteorder="little") // 100,
-        )
-
-    @staticmethod
-    def _get_skills(resource: bytes) -> SimSkills:
-        return SimSkills(
-            int.from_bytes(resource[30:32], byteorder="little") // 100,
-            int.from_bytes(resource[32:34], byteorder="little") // 100,
-            int.from_bytes(resource[34:36], byteorder="little") // 100,
-            int.from_bytes(resource[36:38], byteorder="little") // 100,
-            int.from_bytes(resource[42:44], byteorder="little") // 100,
-            int.from_bytes(resource[46:48], byteorder="little") // 100,
-            int.from_bytes(resource[48:50], byteorder="little") // 100,
-        )
-
-    @staticmethod
-    def _get_sexuality(resource: bytes) -> str:
-        m: int = int.from_bytes(resource[0:2], byteorder="little")
-        f: int = int.from_bytes(resource[2:4], byteorder="little")
+    def _get_sexuality(m: int, f: int) -> str:
         if m >= 2**15:
             m -= 2**16 - 1
         if f >= 2**15:
@@ -380,70 +581,52 @@ class Sim:
         return ""
 
     @staticmethod
-    def _get_supernatural(resource: bytes) -> int:
+    def _get_supernatural(record: SDSCRecord) -> int:
         spnflags: int = SupernaturalFlags(0)
 
-        if resource[322:324] == b"\x28\x00":
+        if record.npc_type == b"\x28\x00":
             spnflags += SupernaturalFlags.SERVO
 
-        pflags: int = int.from_bytes(resource[180:182], byteorder="little")
+        pflags: int = record.person_flags1
         pflag: int
         spnflag: int
-        for pflag, spnflag in {
-            PersonFlags1.ZOMBIE: SupernaturalFlags.ZOMBIE,
-            PersonFlags1.VAMPIRE: SupernaturalFlags.VAMPIRE,
-            PersonFlags1.WEREWOLF: SupernaturalFlags.WEREWOLF,
-            PersonFlags1.PLANTSIM: SupernaturalFlags.PLANTSIM,
-            PersonFlags1.WITCH: SupernaturalFlags.WITCH,
-        }.items():
+        for pflag, spnflag in _SUPERNATURAL_FLAGS:
             if pflags & pflag:
                 spnflags += spnflag
 
-        if config.getboolean("config", "midge", fallback=False):
+        if config_midge:
             if pflags & PersonFlags1.MERMAID:
                 spnflags += SupernaturalFlags.MERMAID
             if pflags & PersonFlags1.GENIE:
                 spnflags += SupernaturalFlags.GENIE
 
-            pflags = int.from_bytes(resource[330:332], byteorder="little")
+            pflags = record.person_flags2
 
             if pflags & PersonFlags2.FAIRY:
                 spnflags += SupernaturalFlags.FAIRY
 
-            if int.from_bytes(resource[148:150], byteorder="little") & (2**8):
+            if record.ghost_flags & (2**8):
                 spnflags += SupernaturalFlags.GHOST
 
         return spnflags
 
-    def _get_job(self, resource: bytes) -> SimCareer:
-        career_guid: str = str(hexlify(resource[190:194]))
-        if career_guid != "b'00000000'" and self.species == b"\x00\x00":
-            career: str = config.get(
-                f"careers.{career_guid}",
-                "name",
-                fallback="Custom",
-            )
+    def _get_job(self, record: SDSCRecord) -> SimCareer:
+        if record.career != b"\x00\x00\x00\x00" and self.species == b"\x00\x00":
+            titles: dict[str, str] = config_careers.get(record.career, {})
+            career: str = titles.get("name", "Custom")
 
-            level: int = int.from_bytes(resource[126:128], byteorder="little")
+            level: int = record.career_level
             max_career_level = 10
             if level > max_career_level:
                 level = max_career_level
             elif level < 0:
                 level = 1
 
-            title: str = config.get(
-                f"careers.{career_guid}",
-                str(level),
-                fallback="Custom",
-            )
+            title: str = titles.get(str(level), "Custom")
         elif self.fam == b"\xff\x7f":
             career = "NPC"
             level = 0
-            title = config.get(
-                "npcs",
-                str(hexlify(resource[322:324])),
-                fallback="Unknown NPC",
-            )
+            title = config_npcs.get(record.npc_type, "Unknown NPC")
         else:
             career = ""
             level = 0
@@ -451,14 +634,11 @@ class Sim:
 
         return SimCareer(career, title, level)
 
-    def _get_age(self, resource: bytes) -> tuple[int, int]:
-        death: int = int.from_bytes(resource[194:196], byteorder="little")
-        age: int = int.from_bytes(
-            resource[196:198],
-            byteorder="little",
-        ) + int.from_bytes(resource[324:326], byteorder="little")
+    def _get_age(self, record: SDSCRecord) -> tuple[int, int]:
+        death: int = record.lifespan
+        age: int = record.age_days + record.prev_age_days
         if self.species != b"\x00\x00":
-            lifestage: bytes = resource[128:130]
+            lifestage: bytes = record.lifestage
             if lifestage > b"\x13\x00":
                 age += 2
             elif lifestage == b"\x13\x00":
@@ -467,12 +647,9 @@ class Sim:
             age += 1
         else:
             age -= death
-        if (
-            resource[128:130] == b"\x02\x00"
-            and int.from_bytes(resource[196:198], byteorder="little") == 0
-        ):
-            age += config.getint("ages", "toddler")
-        if age >= config.getint("ages", "elder"):
+        if record.lifestage == b"\x02\x00" and record.age_days == 0:
+            age += config_ages["toddler"]
+        if age >= config_ages["elder"]:
             if death > age:
                 death = age
             else:
@@ -483,55 +660,22 @@ class Sim:
         return age, death
 
     @staticmethod
-    def _get_interests(resource: bytes) -> SimInterests:
-        return SimInterests(
-            int.from_bytes(resource[260:262], byteorder="little") // 100,
-            int.from_bytes(resource[262:264], byteorder="little") // 100,
-            int.from_bytes(resource[264:266], byteorder="little") // 100,
-            int.from_bytes(resource[266:268], byteorder="little") // 100,
-            int.from_bytes(resource[268:270], byteorder="little") // 100,
-            int.from_bytes(resource[270:272], byteorder="little") // 100,
-            int.from_bytes(resource[272:274], byteorder="little") // 100,
-            int.from_bytes(resource[274:276], byteorder="little") // 100,
-            int.from_bytes(resource[276:278], byteorder="little") // 100,
-            int.from_bytes(resource[278:280], byteorder="little") // 100,
-            int.from_bytes(resource[280:282], byteorder="little") // 100,
-            int.from_bytes(resource[282:284], byteorder="little") // 100,
-            int.from_bytes(resource[284:286], byteorder="little") // 100,
-            int.from_bytes(resource[286:288], byteorder="little") // 100,
-            int.from_bytes(resource[288:290], byteorder="little") // 100,
-            int.from_bytes(resource[290:292], byteorder="little") // 100,
-            int.from_bytes(resource[292:294], byteorder="little") // 100,
-            int.from_bytes(resource[294:296], byteorder="little") // 100,
-        )
-
-    @staticmethod
-    def _get_turnons(resource: bytes) -> list[str]:
+    def _get_turnons(record: SDSCRecord) -> list[str]:
         turn_ons: list[str] = []
         turn_off: str = ""
 
-        tons: list[int] = [
-            int.from_bytes(resource[376:378], byteorder="little"),
-            int.from_bytes(resource[378:380], byteorder="little"),
-            int.from_bytes(resource[414:416], byteorder="little"),
-        ]
-        toffs: list[int] = [
-            int.from_bytes(resource[380:382], byteorder="little"),
-            int.from_bytes(resource[382:384], byteorder="little"),
-            int.from_bytes(resource[416:418], byteorder="little"),
-        ]
-        toflags: list[type[IntFlag]] = [TurnOns1, TurnOns2, TurnOns3]
+        tons: list[int] = [record.turnon1, record.turnon2, record.turnon3]
+        toffs: list[int] = [record.turnoff1, record.turnoff2, record.turnoff3]
 
         index: int = 1
         i: int
         for i in range(3):
-            for flag in toflags[i]:
+            flag: int
+            for flag in _TURNON_FLAGS[i]:
                 if tons[i] & flag:
-                    turn_ons.append(
-                        config.get("turnons", str(index), fallback="Unknown"),
-                    )
+                    turn_ons.append(config_turnons.get(index, "Unknown"))
                 if toffs[i] & flag:
-                    turn_off = config.get("turnons", str(index), fallback="Unknown")
+                    turn_off = config_turnons.get(index, "Unknown")
                 index += 1
 
         turn_ons.extend("" for _ in range(len(turn_ons), 2))
@@ -539,21 +683,6 @@ class Sim:
 
         return turn_ons
 
-    @staticmethod
-    def _get_hobbies(resource: bytes) -> SimHobbies:
-        return SimHobbies(
-            int.from_bytes(resource[420:422], byteorder="little") // 100,
-            int.from_bytes(resource[422:424], byteorder="little") // 100,
-            int.from_bytes(resource[424:426], byteorder="little") // 100,
-            int.from_bytes(resource[426:428], byteorder="little") // 100,
-            int.from_bytes(resource[428:430], byteorder="little") // 100,
-            int.from_bytes(resource[430:432], byteorder="little") // 100,
-            int.from_bytes(resource[432:434], byteorder="little") // 100,
-            int.from_bytes(resource[434:436], byteorder="little") // 100,
-            int.from_bytes(resource[436:438], byteorder="little") // 100,
-            int.from_bytes(resource[438:440], byteorder="little") // 100,
-        )
-
     def set_aspirations(self) -> None:
         """Set aspirations.
 
@@ -564,13 +693,10 @@ class Sim:
         if isinstance(asp1, str):
             return
         if isinstance(asp2, int):
-            self.asp[1] = config.get("aspirations", str(int(log2(asp2))))
-            self.asp[0] = config.get(
-                "aspirations",
-                str(int(log2(asp1 ^ (asp2 & asp1)))),
-            )
+            self.asp[1] = config_aspirations[int(log2(asp2))]
+            self.asp[0] = config_aspirations[int(log2(asp1 ^ (asp2 & asp1)))]
         elif asp1 > 0:
-            self.asp[0] = config.get("aspirations", str(int(log2(asp1))))
+            self.asp[0] = config_aspirations[int(log2(asp1))]
 
     def has_turnon_trait(self, to: int, to_group: int) -> bool:
         """Check if the Sim fulfills a turn on.
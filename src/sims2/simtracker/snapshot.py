@@ -0,0 +1,57 @@
+"""Results of searching a neighborhood."""
+
+from collections.abc import Mapping
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Self, override
+
+from sims2.simtracker.cache import Stamp
+from sims2.simtracker.sim import Family
+from sims2.simtracker.table import SimTable
+
+
+@dataclass(frozen=True)
+class NeighborhoodSnapshot:
+    """Sims and families of a neighborhood as they were when it was searched.
+
+    Searching a neighborhood again returns a new snapshot instead of changing the one that is already shown, so snapshots of several neighborhoods can be kept at once. The fields of a snapshot can't be reassigned and its families are a read-only mapping, but the sim table and the Sim and Family objects in it are ordinary mutable objects, with each Sim created the first time it is looked up. Nothing changes them once the search has finished, and callers should treat them as read-only too.
+
+    Attributes:
+        nhood: Identifier of the neighborhood.
+        directory: Folder of the neighborhood.
+        sims: Sims in the neighborhood, by neighbor ID.
+        families: Families in the neighborhood, by family ID.
+        files: Stamps of the files the neighborhood was searched from.
+        searched: Time the neighborhood was searched at, in seconds since the epoch.
+    """
+
+    nhood: str
+    directory: Path
+    sims: SimTable
+    families: Mapping[bytes, Family]
+    files: tuple[Stamp, ...] = ()
+    searched: float = 0.0
+
+    def __post_init__(self) -> None:
+        """Make families read-only."""
+        object.__setattr__(self, "families", MappingProxyType(dict(self.families)))
+
+    @override
+    def __reduce__(self) -> tuple[type[Self], tuple[Any, ...]]:  # pyright: ignore[reportExplicitAny]
+        """Get arguments to recreate the snapshot with when unpickling, as read-only families can't be pickled.
+
+        Returns:
+            Class and arguments to create the snapshot with.
+        """
+        return (
+            type(self),
+            (
+                self.nhood,
+                self.directory,
+                self.sims,
+                dict(self.families),
+                self.files,
+                self.searched,
+            ),
+        )
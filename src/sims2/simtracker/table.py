@@ -0,0 +1,256 @@
+"""Columnar table of the sims in a neighborhood."""
+
+from collections.abc import Iterable, Iterator, Mapping
+from struct import Struct
+from typing import TYPE_CHECKING, override
+
+from sims2.simtracker._config import config_traits
+from sims2.simtracker.sim import SDSC, SDSC_LAYOUT, SDSCRecord, Sim, compile_layout
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+if TYPE_CHECKING:
+    from numpy import bool_, dtype, uint16, uint32, void
+    from numpy.typing import NDArray
+
+# unsigned integer NumPy array, or tuple of integers if NumPy is not installed
+type Column = NDArray[uint16 | uint32] | tuple[int, ...]
+# boolean NumPy array, or list of booleans if NumPy is not installed
+type Mask = NDArray[bool_] | list[bool]
+
+# byte string fields are read as little-endian integers in columns
+_NUMERIC_CODES: dict[str, str] = {"H": "H", "2s": "H", "4s": "I"}
+_NUMERIC_LAYOUT: tuple[tuple[str, int, str], ...] = tuple(
+    (name, offset, _NUMERIC_CODES[code]) for name, offset, code in SDSC_LAYOUT
+)
+_NUMERIC: Struct = compile_layout(_NUMERIC_LAYOUT)
+
+# NumPy structured dtype of an SDSC resource, derived from the same layout as Sim
+SDSC_DTYPE: "dtype[void] | None" = (
+    np.dtype(
+        {
+            "names": [i[0] for i in _NUMERIC_LAYOUT],
+            "formats": [f"<u{2 if i[2] == 'H' else 4}" for i in _NUMERIC_LAYOUT],
+            "offsets": [i[1] for i in _NUMERIC_LAYOUT],
+            "itemsize": SDSC.size,
+        },
+    )
+    if np is not None
+    else None
+)
+
+
+class SimTable(Mapping[bytes, Sim]):
+    """Columnar table of the sims in a neighborhood, keyed by neighbor ID.
+
+    The SDSC resources of every sim are kept together in one buffer and decoded a field at a time for all sims at once into NumPy structured arrays if NumPy is installed or tuple columns otherwise, so sims can be filtered and sorted without creating a Sim for each of them. A Sim is only created the first time it is looked up, after which the same Sim is returned so changes to it are kept.
+    """
+
+    def __init__(self) -> None:
+        """Initialize an empty table."""
+        self._rows: dict[bytes, int] = {}
+        self._buffer: bytes = b""
+        # columns are kept in _records if NumPy is installed and in _tuples otherwise
+        self._records: NDArray[void] | None = None
+        self._tuples: dict[str, tuple[int, ...]] | None = None
+        self._views: dict[bytes, Sim] = {}
+        self._finalized: bool = False
+
+    def load(self, sims: Iterable[tuple[bytes, bytes]]) -> None:
+        """Replace the sims in the table.
+
+        Args:
+            sims: Neighbor ID and contents of the SDSC of each sim, with later SDSCs replacing earlier ones with the same neighbor ID.
+        """
+        payloads: list[bytes] = []
+        self.clear()
+        nid: bytes
+        resource: bytes
+        for nid, resource in sims:
+            payload: bytes = resource[: SDSC.size].ljust(SDSC.size, b"\x00")
+            if nid in self._rows:
+                payloads[self._rows[nid]] = payload
+            else:
+                self._rows[nid] = len(payloads)
+                payloads.append(payload)
+        self._buffer = b"".join(payloads)
+
+    def clear(self) -> None:
+        """Remove every sim from the table."""
+        self._rows = {}
+        self._buffer = b""
+        self._records = None
+        self._tuples = None
+        self._views = {}
+        self._finalized = False
+
+    @override
+    def __getstate__(self) -> dict[str, object]:
+        """Get state for pickling, leaving out columns as they are rebuilt when needed.
+
+        Returns:
+            State of the table.
+        """
+        return {**self.__dict__, "_records": None, "_tuples": None}
+
+    def finalize(self) -> None:
+        """Finish sims once their inventories have been searched.
+
+        Aspirations are converted to strings and traits are padded for sims that have already been looked up and for every sim looked up afterwards.
+        """
+        self._finalized = True
+        sim: Sim
+        for sim in self._views.values():
+            self._finalize(sim)
+
+    @staticmethod
+    def _finalize(sim: Sim) -> None:
+        sim.set_aspirations()
+        if config_traits:
+            for _ in range(len(sim.traits), 5):
+                sim.traits.append("")
+
+    @override
+    def __getitem__(self, nid: bytes) -> Sim:
+        """Get a sim, creating it from its row of the table if needed.
+
+        Args:
+            nid: Neighbor ID of the sim.
+
+        Returns:
+            The sim.
+        """
+        sim: Sim | None = self._views.get(nid)
+        if sim is None:
+            sim = Sim.from_record(
+                SDSCRecord._make(
+                    SDSC.unpack_from(self._buffer, self._rows[nid] * SDSC.size),
+                ),
+            )
+            if self._finalized:
+                self._finalize(sim)
+            self._views[nid] = sim
+        return sim
+
+    @override
+    def __contains__(self, nid: object) -> bool:
+        """Check if a sim is in the table.
+
+        Args:
+            nid: Neighbor ID of the sim.
+
+        Returns:
+            True if the sim is in the table, otherwise false.
+        """
+        return nid in self._rows
+
+    @override
+    def __iter__(self) -> Iterator[bytes]:
+        """Iterate over the neighbor IDs of the sims in the table.
+
+        Returns:
+            Iterator over neighbor IDs.
+        """
+        return iter(self._rows)
+
+    @override
+    def __len__(self) -> int:
+        """Get number of sims in the table.
+
+        Returns:
+            Number of sims.
+        """
+        return len(self._rows)
+
+    def column(self, name: str) -> Column:
+        """Get a field of the SDSC of every sim, in the order sims were loaded.
+
+        Args:
+            name: Name of field in the SDSC layout.
+
+        Returns:
+            Values of that field for every sim.
+        """
+        if np is not None:
+            if self._records is None:
+                self._records = np.frombuffer(self._buffer, dtype=SDSC_DTYPE)
+            return self._records[name]
+        if self._tuples is None:
+            self._tuples = dict(
+                zip(
+                    (i[0] for i in _NUMERIC_LAYOUT),
+                    zip(*_NUMERIC.iter_unpack(self._buffer), strict=True)
+                    if self._buffer
+                    else ((),) * len(_NUMERIC_LAYOUT),
+                    strict=True,
+                ),
+            )
+        return self._tuples[name]
+
+    def value(self, nid: bytes, name: str) -> int:
+        """Get a field of the SDSC of a sim without creating the sim.
+
+        Args:
+            nid: Neighbor ID of the sim.
+            name: Name of field in the SDSC layout.
+
+        Returns:
+            Value of that field for the sim.
+        """
+        return int(self.column(name)[self._rows[nid]])
+
+    def equals(self, name: str, value: int) -> Mask:
+        """Get mask of sims with a field of their SDSC equal to a value.
+
+        Args:
+            name: Name of field in the SDSC layout.
+            value: Value to match.
+
+        Returns:
+            Mask with a true value for each matching sim.
+        """
+        column: Column = self.column(name)
+        if isinstance(column, tuple):
+            return [i == value for i in column]
+        return column == value
+
+    def select(self, mask: Mask, *, invert: bool = False) -> list[bytes]:
+        """Get the sims matching a mask over the columns of the table.
+
+        Args:
+            mask: Mask with a value for each sim.
+            invert: Get the sims not matching the mask instead.
+
+        Returns:
+            Neighbor IDs of the matching sims, in the order sims were loaded.
+        """
+        nids: list[bytes] = list(self._rows)
+        if np is not None:
+            return [nids[i] for i in np.flatnonzero(mask != invert).tolist()]
+        return [i for i, j in zip(nids, mask, strict=True) if bool(j) != invert]
+
+    def sort(self, name: str, *, reverse: bool = False) -> list[bytes]:
+        """Get the sims sorted by a field of their SDSC.
+
+        Args:
+            name: Name of field in the SDSC layout.
+            reverse: Sort in descending order.
+
+        Returns:
+            Neighbor IDs of the sims, sorted stably by that field.
+        """
+        nids: list[bytes] = list(self._rows)
+        column: Column = self.column(name)
+        order: list[int]
+        if isinstance(column, tuple):
+            order = sorted(range(len(nids)), key=column.__getitem__, reverse=reverse)
+        else:
+            order = (
+                (-column.astype("int64") if reverse else column)
+                .argsort(kind="stable")
+                .tolist()
+            )
+        return [nids[i] for i in order]
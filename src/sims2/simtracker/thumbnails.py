@@ -0,0 +1,99 @@
+"""On-disk cache of the neighborhood thumbnails shown by SimTracker."""
+
+import os
+import tkinter as tk
+from base64 import b64encode
+from hashlib import blake2b
+from logging import Logger, getLogger
+from math import ceil
+from pathlib import Path
+
+logger: Logger = getLogger(__name__)
+
+
+class ThumbnailCache:
+    """On-disk cache of images scaled down to fit in a thumbnail.
+
+    Each thumbnail is saved as a PNG named after the filepath and modification time of the image it was made from, so an image is only decoded and scaled down again once it has changed. Finding a cached thumbnail doesn't use Tk, so it can be done in a background thread, while thumbnails can only be made in the thread running Tk.
+
+    Attributes:
+        folder: Folder the thumbnails are saved in.
+        width: Largest width of a thumbnail.
+        height: Largest height of a thumbnail.
+    """
+
+    def __init__(self, folder: Path, width: int, height: int) -> None:
+        """Initialize the cache.
+
+        Args:
+            folder: Folder to save thumbnails in.
+            width: Largest width of a thumbnail.
+            height: Largest height of a thumbnail.
+        """
+        self.folder: Path = folder
+        self.width: int = width
+        self.height: int = height
+
+    def _prefix(self, source: Path) -> str:
+        key: bytes = f"{source.resolve()}\0{self.width}x{self.height}".encode()
+        return blake2b(key, digest_size=16).hexdigest()
+
+    def path(self, source: Path) -> Path:
+        """Get the filepath of the thumbnail of an image as it is now.
+
+        Args:
+            source: Filepath of the image.
+
+        Returns:
+            Filepath of the thumbnail in the cache.
+        """
+        return self.folder / f"{self._prefix(source)}_{source.stat().st_mtime_ns}.png"
+
+    def load(self, source: Path) -> tuple[Path, str | None]:
+        """Find the thumbnail of an image in the cache.
+
+        Args:
+            source: Filepath of the image.
+
+        Returns:
+            Filepath of the thumbnail in the cache, and its contents as base64 to create a Tk image with, or None if the thumbnail hasn't been made yet.
+        """
+        path: Path = self.path(source)
+        try:
+            return path, b64encode(path.read_bytes()).decode("ascii")
+        except FileNotFoundError:
+            return path, None
+
+    def make(self, source: Path, path: Path) -> tk.PhotoImage:
+        """Make the thumbnail of an image and save it in the cache.
+
+        Args:
+            source: Filepath of the image.
+            path: Filepath to save the thumbnail to, as given by load.
+
+        Returns:
+            The thumbnail.
+        """
+        image: tk.PhotoImage = tk.PhotoImage(file=source)
+        factor: int = max(
+            ceil(image.width() / self.width),
+            ceil(image.height() / self.height),
+        )
+        if factor > 1:
+            image = image.subsample(factor)
+
+        temp: Path = path.with_suffix(".tmp")
+        try:
+            self.folder.mkdir(parents=True, exist_ok=True)
+            image.write(os.fspath(temp), format="png")
+            _ = temp.replace(path)
+        except (OSError, tk.TclError):
+            logger.warning("could not save thumbnail of %s", source)
+            return image
+
+        # thumbnails of earlier versions of the image are no longer needed
+        old: Path
+        for old in self.folder.glob(f"{self._prefix(source)}_*.png"):
+            if old != path:
+                old.unlink(missing_ok=True)
+        return image
@@ -2,10 +2,20 @@
 # pylint: disable=too-many-ancestors
 
 import tkinter as tk
+from collections.abc import Callable, Iterable, Iterator
+from itertools import islice
 from tkinter import ttk
 from typing import Any, Literal, override
 
+# iid, text, and values of a row
+type Row = tuple[str, str, list[Any]]  # pyright: ignore[reportExplicitAny]
+
+# rows inserted each time Tk is idle
+CHUNK_SIZE: int = 200
+
 tabs: list[ttk.Treeview] = []
+# iids of the rows in every SimsTree in sorted order, or empty if unsorted
+sims_order: list[str] = []
 
 
 class ImageButton(ttk.Button):
@@ -15,9 +25,9 @@ class ImageButton(ttk.Button):
         self,
         master: tk.Misc | None,
         *args: Any,  # pyright: ignore[reportAny, reportExplicitAny]
-        imgfile: str | None,
-        imgwidth: int | None,
-        imgheight: int | None,
+        imgfile: str | None = None,
+        imgwidth: int | None = None,
+        imgheight: int | None = None,
         **kwargs: Any,  # pyright: ignore[reportAny, reportExplicitAny]
     ) -> None:
         """Construct an image button with parent master and image.
@@ -41,8 +51,93 @@ class ImageButton(ttk.Button):
             self.image = tk.PhotoImage(file=imgfile, **img_kwargs)  # pyright: ignore[reportAny]
         super().__init__(master, *args, image=self.image, **kwargs)
 
+    def set_image(self, image: tk.PhotoImage) -> None:
+        """Replace the image on the button.
+
+        Args:
+            image: New image.
+        """
+        self.image = image
+        self["image"] = image
+
+
+class LazyTree(ttk.Treeview):
+    """Tk Treeview widget whose rows are only inserted once it is shown.
+
+    Rows are inserted a chunk at a time whenever Tk is idle, so the window keeps repainting and responding while a large tree is filled.
+
+    Attributes:
+        rows: Rows inserted into the tree, in the order they were inserted, with their values as they were given instead of as read back from Tk.
+    """
+
+    def __init__(
+        self,
+        master: tk.Misc | None,
+        *args: Any,  # pyright: ignore[reportAny, reportExplicitAny]
+        **kwargs: Any,  # pyright: ignore[reportAny, reportExplicitAny]
+    ) -> None:
+        """Construct a lazytree with parent master.
+
+        Args:
+            master: Tk widget containing this treeview.
+            *args: Other positional arguments for treeview.
+            **kwargs: Other keyword arguments for treeview.
+        """
+        super().__init__(master, *args, **kwargs)
+        self.rows: list[Row] = []
+        self._source: Callable[[], Iterable[Row]] | None = None
+        self._pending: Iterator[Row] | None = None
+        self._after: str | None = None
+
+    @property
+    def filling(self) -> bool:
+        """Whether some rows have not been inserted yet."""
+        return self._source is not None or self._pending is not None
+
+    def defer(self, rows: Callable[[], Iterable[Row]]) -> None:
+        """Remove every row and set the rows to insert once the tree is shown.
+
+        Args:
+            rows: Function getting the rows to insert, which is only called once the tree is shown.
+        """
+        if self._after is not None:
+            self.after_cancel(self._after)
+            self._after = None
+        self._pending = None
+        self.delete(*self.get_children())
+        self.rows = []
+        self._source = rows
+
+    def show(self) -> None:
+        """Start inserting the deferred rows, if they haven't been already."""
+        if self._source is None:
+            return
+        self._pending = iter(self._source())
+        self._source = None
+        self._after = self.after_idle(self._insert_chunk)
+
+    def _insert_chunk(self) -> None:
+        if self._pending is None:
+            return
+        rows: list[Row] = list(islice(self._pending, CHUNK_SIZE))
+        iid: str
+        text: str
+        values: list[Any]  # pyright: ignore[reportExplicitAny]
+        for iid, text, values in rows:
+            _ = self.insert("", tk.END, iid=iid, text=text, values=values)
+        self.rows += rows
+        if len(rows) < CHUNK_SIZE:
+            self._pending = None
+            self._after = None
+            self.filled()
+        else:
+            self._after = self.after_idle(self._insert_chunk)
+
+    def filled(self) -> None:
+        """Finish the tree once every row has been inserted."""
+
 
-class SortTree(ttk.Treeview):
+class SortTree(LazyTree):
     """Tk Treeview widget that can be sorted."""
 
     def __init__(self, master: tk.Frame, columns: list[str], widths: list[int]) -> None:
@@ -77,58 +172,70 @@ class SortTree(ttk.Treeview):
                 command=lambda column=j: self.sort_column(column, reverse=False),
             )
 
+        self._columns: list[str] = columns
+        self._orders: dict[tuple[str, bool], list[str]] = {}
+
         _ = self.bind("<Button-3>", self.right_click)
         _ = self.bind("<Button-2>", self.middle_click)
 
         tabs.append(self)
 
-    def sort(self, cols: list[tuple[str | int, str]]) -> None:
+    @override
+    def defer(self, rows: Callable[[], Iterable[Row]]) -> None:
+        """Remove every row and set the rows to insert once the tree is shown.
+
+        Args:
+            rows: Function getting the rows to insert, which is only called once the tree is shown.
+        """
+        super().defer(rows)
+        self._orders.clear()
+
+    def sort(self, iids: list[str]) -> None:
         """Sort tree.
 
         Args:
-            cols: Sorted list of tuples with value and identifier for each row in column.
+            iids: Identifier of each row in sorted order.
         """
-        i: int
-        k: str
-        for i, (_, k) in enumerate(cols):
-            self.move(k, "", i)
+        self.set_children("", *iids)
 
     def unsort(self) -> None:
         """Undo any sorting."""
-        children: list[str] = list(self.get_children())
-        children.sort()
+        self.sort([i[0] for i in self.rows])
 
-        j: int
-        k: str
-        for j, k in enumerate(children):
-            self.move(k, "", j)
+    def _keys(self, column: str) -> list[Any]:  # pyright: ignore[reportExplicitAny]
+        if column == "#0":
+            return [i[1] for i in self.rows]
+        # columns are given by name from headings or by number when clicked on
+        index: int = (
+            int(column[1:]) - 1 if column[0] == "#" else self._columns.index(column)
+        )
+        values: list[Any] = [i[2][index] for i in self.rows]  # pyright: ignore[reportExplicitAny]
+        try:
+            return [int(i) for i in values]  # pyright: ignore[reportAny]
+        except (TypeError, ValueError):
+            return [str(i) for i in values]  # pyright: ignore[reportAny]
 
-    def get_sorted_columns(
-        self,
-        column: str,
-        *,
-        reverse: bool,
-    ) -> list[tuple[str | int, str]]:
-        """Get sorted columns.
+    def get_sorted_iids(self, column: str, *, reverse: bool) -> list[str]:
+        """Get rows sorted by column.
+
+        Columns are sorted by number if every value in them is a number and as text otherwise. The order of each column is saved until the rows are replaced.
 
         Args:
             column: Name of column to sort by.
             reverse: Whether to sort in reverse.
 
         Returns:
-            Sorted list of tuples with value and identifier for each row in column.
+            Identifier of each row in sorted order.
         """
-        if column == "#0":
-            cols: list[tuple[str | int, str]] = [
-                (self.item(i)["text"], i) for i in self.get_children()
+        order: list[str] | None = self._orders.get((column, reverse))
+        if order is None:
+            keys: list[Any] = self._keys(column)  # pyright: ignore[reportExplicitAny]
+            order = [
+                self.rows[i][0]
+                for i in sorted(range(len(keys)), key=keys.__getitem__, reverse=reverse)
             ]
-        else:
-            try:
-                cols = [(int(self.set(i, column)), i) for i in self.get_children()]  # pyright: ignore[reportAny]
-            except ValueError:
-                cols = [(self.set(i, column), i) for i in self.get_children()]
-        cols.sort(reverse=reverse, key=lambda i: i[0])
-        return cols
+            self._orders[column, reverse] = order
+        return order
 
     def sort_column(self, column: str, *, reverse: bool) -> None:
         """Sort by column.
@@ -137,12 +244,10 @@ class SortTree(ttk.Treeview):
             column: Name of column to sort by.
             reverse: Whether to sort in reverse.
         """
-        cols: list[tuple[str | int, str]] = self.get_sorted_columns(
-            column,
-            reverse=reverse,
-        )
+        if self.filling:
+            return
 
-        self.sort(cols)
+        self.sort(self.get_sorted_iids(column, reverse=reverse))
 
     def right_click(self, event: tk.Event) -> None:
         """On right click, identify column heading clicked on and sort by that column in reverse."""
@@ -152,7 +257,8 @@ class SortTree(ttk.Treeview):
 
     def middle_click(self, _: tk.Event) -> None:
         """On middle click, undo any sorting."""
-        self.unsort()
+        if not self.filling:
+            self.unsort()
 
     @override
     def pack(
@@ -167,7 +273,26 @@ class SortTree(ttk.Treeview):
 
 
 class SimsTree(SortTree):
-    """Tk Treeview widget that can be sorted together with other SimsTree widgets."""
+    """Tk Treeview widget that can be sorted together with other SimsTree widgets.
+
+    Every SimsTree has a row with the same iid for each sim. Trees that are still being filled are sorted once they are full instead.
+    """
+
+    @override
+    def defer(self, rows: Callable[[], Iterable[Row]]) -> None:
+        """Remove every row and set the rows to insert once the tree is shown.
+
+        Args:
+            rows: Function getting the rows to insert, which is only called once the tree is shown.
+        """
+        super().defer(rows)
+        sims_order.clear()
+
+    @override
+    def filled(self) -> None:
+        """Sort the tree the same as the other SimsTree widgets once it is full."""
+        if sims_order:
+            self.sort(sims_order)
 
     @override
     def sort_column(self, column: str, *, reverse: bool) -> None:
@@ -177,22 +302,28 @@ class SimsTree(SortTree):
             column: Name of column to sort by.
             reverse: Whether to sort in reverse.
         """
-        cols: list[tuple[str | int, str]] = self.get_sorted_columns(
-            column,
-            reverse=reverse,
-        )
+        if self.filling:
+            return
+
+        iids: list[str] = self.get_sorted_iids(column, reverse=reverse)
+        sims_order[:] = iids
 
         tab: ttk.Treeview
         for tab in tabs:
-            if not isinstance(tab, SimsTree):
+            if not isinstance(tab, SimsTree) or tab.filling:
                 continue
-            tab.sort(cols)
+            tab.sort(iids)
 
     @override
-    def middle_click(self, _: tk.Event) -> None:  # noqa: PLR6301
+    def middle_click(self, _: tk.Event) -> None:
         """On middle click, undo any sorting."""
+        if self.filling:
+            return
+
+        sims_order.clear()
+
         tab: ttk.Treeview
         for tab in tabs:
-            if not isinstance(tab, SimsTree):
+            if not isinstance(tab, SimsTree) or tab.filling:
                 continue
             tab.unsort()